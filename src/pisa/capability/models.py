@@ -10,8 +10,9 @@ from typing import Any, Dict, Optional, List, Union, Literal, Callable, get_type
 from datetime import datetime
 import inspect
 import logging
+import sys
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 _logger = logging.getLogger(__name__)
 
@@ -19,6 +20,9 @@ _logger = logging.getLogger(__name__)
 # Type definitions
 CapabilityType = Literal["function", "agent", "mcp"]
 
+# Max description length shown in capability tables
+DISPLAY_DESCRIPTION_LIMIT = 60
+
 
 def _is_agent(obj: Any) -> bool:
     """Check if an object is an Agent instance."""
@@ -86,6 +90,47 @@ class Capability(BaseModel):
     mcp_config: Optional[Dict[str, Any]] = Field(default=None)
     """MCP server configuration metadata"""
     
+    @field_validator("capability_type")
+    @classmethod
+    def _intern_capability_type(cls, value: str) -> str:
+        """Intern the type so dispatch comparisons hit the identity fast path."""
+        return sys.intern(value)
+    
+    # Display values derived from immutable fields, computed once
+    _logical_type: str = PrivateAttr(default="FUNCTION")
+    _display_description: str = PrivateAttr(default="")
+    
+    def model_post_init(self, _context: Any, /) -> None:
+        """Precompute display values so tables don't redo them per render."""
+        tags = self.tags
+        if "mcp" in tags:
+            self._logical_type = "MCP"
+        elif "agent" in tags or "subagent" in tags:
+            self._logical_type = "AGENT"
+        else:
+            self._logical_type = "FUNCTION"
+        
+        description = self.description
+        if len(description) > DISPLAY_DESCRIPTION_LIMIT:
+            self._display_description = description[:DISPLAY_DESCRIPTION_LIMIT] + "..."
+        else:
+            self._display_description = description
+    
+    @property
+    def logical_type(self) -> str:
+        """
+        Logical type inferred from tags, used for display.
+        
+        All capabilities are FunctionTools at the SDK level, so the
+        user-facing category comes from tags rather than capability_type.
+        """
+        return self._logical_type
+    
+    @property
+    def display_description(self) -> str:
+        """Description truncated for table display."""
+        return self._display_description
+    
     def to_dict(self) -> Dict[str, Any]:
         """Dump the Capability to a dictionary."""
         data = self.model_dump(exclude={'agent_object', 'mcp_server_object'})
@@ -48,6 +48,7 @@ class CapabilityRegistry:
         """
         self._capabilities: Dict[str, Capability] = {}
         self._functions: Dict[str, Callable] = {}
+        self._version = 0
         self.auto_register = auto_register
         _logger.info("CapabilityRegistry initialized")
     
@@ -68,6 +69,7 @@ class CapabilityRegistry:
         self._capabilities[name] = capability_obj
         if func is not None:
             self._functions[name] = func
+        self._version += 1
         
         _logger.debug(f"Registered capability: {name}")
     
@@ -105,6 +107,11 @@ class CapabilityRegistry:
         _logger.info(f"Registered MCP capability: {cap.name}")
         return cap
     
+    @property
+    def version(self) -> int:
+        """Counter bumped on every registration change, for cache invalidation."""
+        return self._version
+    
     def get(self, name: str) -> Optional[Capability]:
         """Get a capability by name."""
         return self._capabilities.get(name)
@@ -144,6 +151,7 @@ class CapabilityRegistry:
         count = len(self._capabilities)
         self._capabilities.clear()
         self._functions.clear()
+        self._version += 1
         _logger.info(f"Cleared {count} capabilities")
     
     def discover_from_module(self, module_path: str) -> List[str]:
@@ -220,12 +220,13 @@ class Config:
             )
             ```
         """
-        if not cls._initialized:
-            cls.load()
-
+        # 已配置时直接返回（最常见路径，先于其他检查）
         if cls._agent_sdk_configured and not force:
             return True
 
+        if not cls._initialized:
+            cls.load()
+
         if not _HAS_AGENTS:
             raise ImportError(
                 "OpenAI Agent SDK not installed. "
@@ -10,6 +10,10 @@ from enum import Enum
 from pydantic import BaseModel, Field
 
 
+# 为展示保留的最近消息数量
+RECENT_MESSAGES_LIMIT = 3
+
+
 class MessageRole(str, Enum):
     """消息角色"""
     USER = "user"
@@ -159,6 +163,27 @@ class ContextState(BaseModel):
         
         self.updated_at = datetime.now()
     
+    def get_message_count(self) -> int:
+        """获取所有轮次中的消息总数（add_message 写入的位置）"""
+        return sum(len(round_ctx.messages) for round_ctx in self.rounds)
+    
+    def get_recent_message_dumps(
+        self,
+        limit: int = RECENT_MESSAGES_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        获取最近消息的字典形式（最多 limit 条）
+        
+        从最后一轮向前取，只序列化需要展示的消息，不展开全部历史。
+        """
+        recent: List[Message] = []
+        for round_ctx in reversed(self.rounds):
+            needed = limit - len(recent)
+            if needed <= 0:
+                break
+            recent[:0] = round_ctx.messages[-needed:]
+        return [msg.model_dump() for msg in recent]
+    
     def _is_round_complete(self, round_ctx: RoundContext) -> bool:
         """判断轮次是否完成（有用户输入和助手回复）"""
         if not round_ctx.messages:
@@ -252,11 +252,12 @@ class BaseAgentLoop(IAgentLoop):
         
         resolver = CapabilityResolver(get_global_registry())
         
-        # 显示配置的capabilities
-        try:
-            resolver.display_info(capability_names)
-        except Exception as e:
-            _logger.warning(f"Failed to display capabilities info: {e}")
+        # 显示配置的capabilities（可观测性关闭时跳过）
+        if self.config.observability.enabled:
+            try:
+                resolver.display_info(capability_names)
+            except Exception as e:
+                _logger.warning(f"Failed to display capabilities info: {e}")
         
         # 解析为SDK格式
         try:
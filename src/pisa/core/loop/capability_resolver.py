@@ -27,12 +27,18 @@ resolver.display_info(["tool1", "tool2", "agent1"])
 ```
 """
 
+import asyncio
+import inspect
+import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from rich.table import Table
-from rich.console import Console
+from rich.panel import Panel
+from rich.syntax import Syntax
 from rich import box
 
+from pisa.utils.logger import console as _shared_console
+
 _logger = logging.getLogger(__name__)
 
 
@@ -54,7 +60,13 @@ class CapabilityResolver:
             registry: CapabilityRegistry实例
         """
         self.registry = registry
-        self._console = Console()
+        # name → (capability_type, 对象)，registry.version 变化时失效
+        self._resolved: Dict[str, Tuple[str, Any]] = {}
+        self._resolved_version = registry.version
+        # 复用进程级共享 Console，避免每个 Resolver 重复探测终端
+        self._console = _shared_console
+        # 非交互终端（CI、守护进程、日志管道）不渲染 Rich 表格
+        self._is_tty = self._console.is_terminal
     
     def resolve(
         self,
@@ -86,15 +98,35 @@ class CapabilityResolver:
         mcp_servers = []
         missing = []
         
-        _logger.info(f"Resolving {len(capability_names)} capabilities...")
+        # capability_type → 目标列表
+        buckets = {
+            "function": functions,
+            "agent": handoffs,
+            "mcp": mcp_servers,
+        }
+        
+        debug_enabled = _logger.isEnabledFor(logging.DEBUG)
+        _logger.info("Resolving %d capabilities...", len(capability_names))
+        
+        # registry 变化后丢弃已解析的缓存
+        if self._resolved_version != self.registry.version:
+            self._resolved.clear()
+            self._resolved_version = self.registry.version
+        resolved = self._resolved
         
         for name in capability_names:
+            # 命中缓存：一次字典查询即可分类
+            entry = resolved.get(name)
+            if entry is not None:
+                buckets[entry[0]].append(entry[1])
+                continue
+            
             # 从registry查询
             cap = self.registry.get(name)
             
             if not cap:
                 missing.append(name)
-                _logger.warning(f"Capability not found: {name}")
+                _logger.warning("Capability not found: %s", name)
                 continue
             
             # 获取实际对象
@@ -102,22 +134,129 @@ class CapabilityResolver:
                 obj = cap.get_object(registry=self.registry)
                 
                 # 根据类型分类
-                if cap.capability_type == "function":
-                    functions.append(obj)
-                    _logger.debug(f"Resolved function: {name} -> {type(obj).__name__}")
-                elif cap.capability_type == "agent":
-                    handoffs.append(obj)
-                    _logger.debug(f"Resolved agent: {name} -> {type(obj).__name__}")
-                elif cap.capability_type == "mcp":
-                    mcp_servers.append(obj)
-                    _logger.debug(f"Resolved mcp: {name} -> {type(obj).__name__}")
+                bucket = buckets.get(cap.capability_type)
+                if bucket is not None:
+                    bucket.append(obj)
+                    resolved[name] = (cap.capability_type, obj)
+                    if debug_enabled:
+                        _logger.debug(
+                            "Resolved %s: %s -> %s",
+                            cap.capability_type, name, type(obj).__name__
+                        )
                 else:
-                    _logger.warning(f"Unknown capability type: {cap.capability_type} for {name}")
+                    _logger.warning("Unknown capability type: %s for %s", cap.capability_type, name)
             
             except Exception as e:
-                _logger.error(f"Failed to get object for capability {name}: {e}")
+                _logger.error("Failed to get object for capability %s: %s", name, e)
                 missing.append(name)
         
+        return self._finalize(functions, handoffs, mcp_servers, missing, raise_on_missing)
+    
+    async def resolve_async(
+        self,
+        capability_names: List[str],
+        raise_on_missing: bool = True
+    ) -> Dict[str, List[Any]]:
+        """
+        并发解析capability列表
+        
+        与 resolve() 结果相同，但所有 get_object 调用并发执行：
+        MCP 类型在线程中获取（可能涉及握手等 I/O），返回 awaitable
+        的实现会被 await。启动时解析多个 MCP server 的耗时从各自
+        往返时间之和降为其中的最大值。
+        
+        Args:
+            capability_names: Capability名称列表
+            raise_on_missing: 是否在capability不存在时抛出异常
+            
+        Returns:
+            与 resolve() 相同的三列表字典
+            
+        Raises:
+            ValueError: 如果有capability不存在且raise_on_missing=True
+        """
+        functions = []
+        handoffs = []
+        mcp_servers = []
+        missing = []
+        
+        buckets = {
+            "function": functions,
+            "agent": handoffs,
+            "mcp": mcp_servers,
+        }
+        
+        debug_enabled = _logger.isEnabledFor(logging.DEBUG)
+        _logger.info("Resolving %d capabilities concurrently...", len(capability_names))
+        
+        found = []
+        for name in capability_names:
+            cap = self.registry.get(name)
+            if not cap:
+                missing.append(name)
+                _logger.warning("Capability not found: %s", name)
+                continue
+            found.append((name, cap))
+        
+        # 单个失败不影响其他capability
+        objects = await asyncio.gather(
+            *(self._get_object_async(cap) for _, cap in found),
+            return_exceptions=True
+        )
+        
+        # 按原始顺序分类
+        for (name, cap), obj in zip(found, objects, strict=True):
+            if isinstance(obj, Exception):
+                _logger.error("Failed to get object for capability %s: %s", name, obj)
+                missing.append(name)
+                continue
+            
+            bucket = buckets.get(cap.capability_type)
+            if bucket is not None:
+                bucket.append(obj)
+                if debug_enabled:
+                    _logger.debug(
+                        "Resolved %s: %s -> %s",
+                        cap.capability_type, name, type(obj).__name__
+                    )
+            else:
+                _logger.warning("Unknown capability type: %s for %s", cap.capability_type, name)
+        
+        return self._finalize(functions, handoffs, mcp_servers, missing, raise_on_missing)
+    
+    async def _get_object_async(self, cap: Any) -> Any:
+        """
+        异步获取capability的实际对象
+        
+        Args:
+            cap: Capability实例
+            
+        Returns:
+            get_object() 返回的对象
+        """
+        if cap.capability_type == "mcp":
+            obj = await asyncio.to_thread(cap.get_object, registry=self.registry)
+        else:
+            obj = cap.get_object(registry=self.registry)
+        
+        if inspect.isawaitable(obj):
+            obj = await obj
+        return obj
+    
+    def _finalize(
+        self,
+        functions: List[Any],
+        handoffs: List[Any],
+        mcp_servers: List[Any],
+        missing: List[str],
+        raise_on_missing: bool
+    ) -> Dict[str, List[Any]]:
+        """
+        检查缺失项并组装解析结果
+        
+        Raises:
+            ValueError: 如果有capability不存在且raise_on_missing=True
+        """
         # 检查缺失的capabilities
         if missing and raise_on_missing:
             available = self.registry.list_all()
@@ -128,9 +267,8 @@ class CapabilityResolver:
             )
         
         _logger.info(
-            f"Resolved: {len(functions)} functions, "
-            f"{len(handoffs)} handoffs, "
-            f"{len(mcp_servers)} mcp_servers"
+            "Resolved: %d functions, %d handoffs, %d mcp_servers",
+            len(functions), len(handoffs), len(mcp_servers)
         )
         
         return {
@@ -153,6 +291,10 @@ class CapabilityResolver:
             capability_names: Capability名称列表
             title: 表格标题
         """
+        if not self._is_tty:
+            _logger.info("Capabilities: %s", capability_names)
+            return
+        
         table = Table(
             title=title,
             box=box.ROUNDED,
@@ -165,35 +307,20 @@ class CapabilityResolver:
         table.add_column("Description", style="white")
         table.add_column("Status", style="green", justify="center")
         
+        # 先收集所有行，再一次性写入表格
+        rows = []
         for name in capability_names:
             cap = self.registry.get(name)
             
             if cap:
                 # 成功找到
-                desc = cap.description[:60] + "..." if len(cap.description) > 60 else cap.description
-                
-                # 从 tags 推断逻辑类型
-                logical_type = "FUNCTION"
-                if cap.tags:
-                    if "mcp" in cap.tags:
-                        logical_type = "MCP"
-                    elif "agent" in cap.tags or "subagent" in cap.tags:
-                        logical_type = "AGENT"
-                
-                table.add_row(
-                    cap.name,
-                    logical_type,
-                    desc,
-                    "✓"
-                )
+                rows.append((cap.name, cap.logical_type, cap.display_description, "✓"))
             else:
                 # 未找到
-                table.add_row(
-                    name,
-                    "???",
-                    "[red]Not found in registry[/red]",
-                    "✗"
-                )
+                rows.append((name, "???", "[red]Not found in registry[/red]", "✗"))
+        
+        for row in rows:
+            table.add_row(*row)
         
         self._console.print()
         self._console.print(table)
@@ -211,9 +338,9 @@ class CapabilityResolver:
         Args:
             capability_names: Capability名称列表
         """
-        from rich.panel import Panel
-        from rich.syntax import Syntax
-        import json
+        if not self._is_tty:
+            _logger.info("Capabilities: %s", capability_names)
+            return
         
         for name in capability_names:
             cap = self.registry.get(name)
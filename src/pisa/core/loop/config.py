@@ -7,8 +7,8 @@ Loop Configuration
 3. 支持从AgentDefinition加载配置
 """
 
-from typing import Dict, Any, Optional, List
-from pydantic import BaseModel, Field
+from typing import Dict, Any, FrozenSet, NamedTuple, Optional, List
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from pisa.core.loop.modules.base import (
     ModuleConfig,
@@ -22,8 +22,45 @@ from pisa.core.definition.models import AgentDefinition
 from pisa.config import Config
 
 
+# 模块名称 → 模块配置类型
+MODULE_CONFIG_TYPES: Dict[str, type] = {
+    "planning": PlanningModuleConfig,
+    "execution": ExecutionModuleConfig,
+    "reflection": ReflectionModuleConfig,
+    "observe": ObserveModuleConfig,
+    "validation": ValidationModuleConfig,
+}
+
+
+class LoopModules(NamedTuple):
+    """按模块名称直接访问的模块配置（未配置的模块为 None）"""
+    planning: Optional[PlanningModuleConfig] = None
+    execution: Optional[ExecutionModuleConfig] = None
+    reflection: Optional[ReflectionModuleConfig] = None
+    validation: Optional[ValidationModuleConfig] = None
+    observe: Optional[ObserveModuleConfig] = None
+
+
+def _build_module_configs(modules: Dict[str, Dict[str, Any]]) -> Dict[str, ModuleConfig]:
+    """
+    将原始模块配置字典一次性校验为对应的模块配置类型
+    
+    Args:
+        modules: 模块名称 → 原始配置字典
+        
+    Returns:
+        模块名称 → 模块配置实例
+    """
+    return {
+        name: MODULE_CONFIG_TYPES.get(name, ModuleConfig).model_validate(data)
+        for name, data in modules.items()
+    }
+
+
 class ContextConfig(BaseModel):
-    """Context配置"""
+    """Context配置（不可变）"""
+    model_config = ConfigDict(frozen=True)
+    
     max_tokens: int = Field(default=100000, description="最大token数")
     compression_threshold: float = Field(default=0.8, description="压缩阈值")
     compression_strategy: str = Field(default="adaptive", description="压缩策略")
@@ -31,7 +68,9 @@ class ContextConfig(BaseModel):
 
 
 class ObservabilityConfig(BaseModel):
-    """可观测性配置"""
+    """可观测性配置（不可变）"""
+    model_config = ConfigDict(frozen=True)
+    
     enabled: bool = Field(default=True, description="是否启用")
     log_level: str = Field(default="INFO", description="日志级别")
     show_context: bool = Field(default=True, description="是否显示context")
@@ -59,6 +98,31 @@ class LoopConfig(BaseModel):
     modules: Dict[str, ModuleConfig] = Field(default_factory=dict)
     enabled_modules: Dict[str, bool] = Field(default_factory=dict)
     
+    # 已启用模块名称集合（由 enabled_modules 派生）
+    _enabled_set: FrozenSet[str] = PrivateAttr(default=frozenset())
+    # 固定字段的模块配置视图（由 modules 派生）
+    _module_tuple: LoopModules = PrivateAttr(default=LoopModules())
+    
+    def model_post_init(self, _context: Any, /) -> None:
+        """预先计算已启用模块集合和模块配置视图"""
+        self._enabled_set = frozenset(
+            name for name, enabled in self.enabled_modules.items() if enabled
+        )
+        self._module_tuple = LoopModules(**{
+            name: config
+            for name, config in self.modules.items()
+            if name in LoopModules._fields
+        })
+    
+    @property
+    def module_configs(self) -> LoopModules:
+        """
+        模块配置的固定字段视图
+        
+        已知模块名时可直接属性访问，如 config.module_configs.planning。
+        """
+        return self._module_tuple
+    
     @classmethod
     def from_definition(
         cls,
@@ -76,7 +140,16 @@ class LoopConfig(BaseModel):
             LoopConfig实例
         """
         # 基础配置
-        default_model = definition.models.default_model or "gpt-4"
+        m = definition.models
+        default_model = m.default_model or "gpt-4"
+        # 一次性解析各模块模型（模块专用模型 → 默认模型）
+        models = {
+            "planning": m.planning_model or default_model,
+            "execution": m.execution_model or default_model,
+            "reflection": m.reflection_model or default_model,
+            "validation": m.validation_model or default_model,
+            "observe": m.observe_model or default_model,
+        }
         config_dict = {
             "name": definition.metadata.name,
             "model": default_model,
@@ -108,44 +181,44 @@ class LoopConfig(BaseModel):
         
         # Planning配置
         if definition.planning_config:
-            modules_dict["planning"] = PlanningModuleConfig(
-                model=definition.models.planning_model or default_model,
-                instructions=definition.planning_config.planning_instructions or "",
-            )
+            modules_dict["planning"] = {
+                "model": models["planning"],
+                "instructions": definition.planning_config.planning_instructions or "",
+            }
             enabled_dict["planning"] = definition.planning_config.enabled
         
         # Execution配置（默认启用）
-        modules_dict["execution"] = ExecutionModuleConfig(
-            model=definition.models.execution_model or default_model,
-        )
+        modules_dict["execution"] = {
+            "model": models["execution"],
+        }
         enabled_dict["execution"] = True
         
         # Reflection配置（默认启用）
-        modules_dict["reflection"] = ReflectionModuleConfig(
-            model=definition.models.reflection_model or default_model,
-        )
+        modules_dict["reflection"] = {
+            "model": models["reflection"],
+        }
         enabled_dict["reflection"] = definition.runtime_config.enable_reflection
         
         # Observe配置（默认启用）
-        modules_dict["observe"] = ObserveModuleConfig(
-            model=getattr(definition.models, 'observe_model', None) or default_model,
-        )
+        modules_dict["observe"] = {
+            "model": models["observe"],
+        }
         enabled_dict["observe"] = True
         
         # Validation配置（如果有validation规则）
         if definition.validation_rules:
-            modules_dict["validation"] = ValidationModuleConfig(
-                model=definition.models.validation_model or default_model,
-            )
+            modules_dict["validation"] = {
+                "model": models["validation"],
+            }
             enabled_dict["validation"] = definition.runtime_config.enable_validation
         
-        config_dict["modules"] = modules_dict
+        config_dict["modules"] = _build_module_configs(modules_dict)
         config_dict["enabled_modules"] = enabled_dict
         
         # 应用覆盖
         config_dict.update(overrides)
         
-        return cls(**config_dict)
+        return cls.model_validate(config_dict)
     
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> "LoopConfig":
@@ -173,14 +246,12 @@ class LoopConfig(BaseModel):
         
         if "modules" not in config_dict:
             default_model = config_dict.get("model", Config.agent_default_model)
-            config_dict["modules"] = {
-                "planning": PlanningModuleConfig(model=default_model),
-                "execution": ExecutionModuleConfig(model=default_model),
-                "reflection": ReflectionModuleConfig(model=default_model),
-                "observe": ObserveModuleConfig(model=default_model),
-            }
+            config_dict["modules"] = _build_module_configs({
+                name: {"model": default_model}
+                for name in ("planning", "execution", "reflection", "observe")
+            })
         
-        return cls(**config_dict)
+        return cls.model_validate(config_dict)
     
     def is_module_enabled(self, module_name: str) -> bool:
         """
@@ -192,7 +263,7 @@ class LoopConfig(BaseModel):
         Returns:
             是否启用
         """
-        return self.enabled_modules.get(module_name, False)
+        return module_name in self._enabled_set
     
     def get_module_config(self, module_name: str) -> Optional[ModuleConfig]:
         """
@@ -9,14 +9,42 @@ Loop层的Context包装器，提供便捷的Context操作接口
 3. 提供便捷的 Context 操作方法
 """
 
+import json
 import logging
 from typing import Any, Dict, List, Optional
 
-from pisa.core.context import ContextManager
+from pydantic import BaseModel
+
+from pisa.core.context import ContextManager, MessageRole
 
 _logger = logging.getLogger(__name__)
 
 
+def _to_message_content(value: Any) -> str:
+    """
+    将观察/决策对象转换为消息文本
+    
+    字符串直接使用；Pydantic 模型和 dict/list 序列化为 JSON，
+    避免 str() 逐层构造 repr；其他类型回退到 str()。
+    
+    Args:
+        value: 待转换的对象
+        
+    Returns:
+        消息文本
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    if isinstance(value, (dict, list)):
+        try:
+            return json.dumps(value, ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            return str(value)
+    return str(value)
+
+
 class LoopContext:
     """
     Loop Context 包装器
@@ -24,6 +52,8 @@ class LoopContext:
     包装 ContextManager，提供更高层次的 Context 操作接口
     """
     
+    __slots__ = ("context_manager",)
+    
     def __init__(
         self, 
         context_manager: Optional[ContextManager] = None,
@@ -70,9 +100,13 @@ class LoopContext:
         Args:
             observation: 观察结果
         """
-        # 将观察结果转换为消息格式
-        content = str(observation) if not isinstance(observation, str) else observation
-        self.add_message(role="system", content=f"[OBSERVATION] {content}")
+        # 将观察结果转换为消息格式（tag 供消费方过滤，无需解析内容前缀）
+        content = _to_message_content(observation)
+        self.add_message(
+            role=MessageRole.SYSTEM,
+            content=f"[OBSERVATION] {content}",
+            tag="observation"
+        )
     
     def add_decision_message(self, decision: Any) -> None:
         """
@@ -81,9 +115,13 @@ class LoopContext:
         Args:
             decision: 决策结果
         """
-        # 将决策结果转换为消息格式
-        content = str(decision) if not isinstance(decision, str) else decision
-        self.add_message(role="system", content=f"[DECISION] {content}")
+        # 将决策结果转换为消息格式（tag 供消费方过滤，无需解析内容前缀）
+        content = _to_message_content(decision)
+        self.add_message(
+            role=MessageRole.SYSTEM,
+            content=f"[DECISION] {content}",
+            tag="decision"
+        )
     
     def get_messages(self) -> List[Dict[str, Any]]:
         """
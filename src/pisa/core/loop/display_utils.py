@@ -11,7 +11,6 @@ Loop 展示工具
 """
 
 from typing import Any, Optional
-from rich.console import Console
 from rich.table import Table
 from rich.tree import Tree as RichTree
 from rich.panel import Panel
@@ -20,9 +19,16 @@ from rich import box
 from pisa.core.planning import TaskTree, TaskStatus
 from pisa.core.context.models import ContextState
 from pisa.utils import context_display
+from pisa.utils.logger import console
 
-
-console = Console()
+# 任务状态 → 展示图标
+_STATUS_ICONS = {
+    TaskStatus.PENDING: "⏸️",
+    TaskStatus.RUNNING: "▶️",
+    TaskStatus.COMPLETED: "✅",
+    TaskStatus.FAILED: "❌",
+    TaskStatus.BLOCKED: "🚫",
+}
 
 
 def display_loop_definition(loop_definition: Any) -> None:
@@ -46,36 +52,44 @@ def display_loop_definition(loop_definition: Any) -> None:
     table.add_column("值", style="white")
     
     # 基本信息
-    table.add_row("Loop Type", loop_definition.loop_type)
-    table.add_row("Version", loop_definition.version)
-    table.add_row("Description", loop_definition.description or "-")
+    rows = [
+        ("Loop Type", loop_definition.loop_type),
+        ("Version", loop_definition.version),
+        ("Description", loop_definition.description or "-"),
+    ]
     
     # 模型配置
     if loop_definition.model:
-        table.add_row("Default Model", loop_definition.model)
-    if hasattr(loop_definition, 'planning_model') and loop_definition.planning_model:
-        table.add_row("Planning Model", loop_definition.planning_model)
-    if hasattr(loop_definition, 'execution_model') and loop_definition.execution_model:
-        table.add_row("Execution Model", loop_definition.execution_model)
-    if hasattr(loop_definition, 'reflection_model') and loop_definition.reflection_model:
-        table.add_row("Reflection Model", loop_definition.reflection_model)
+        rows.append(("Default Model", loop_definition.model))
+    for attr, label in (
+        ("planning_model", "Planning Model"),
+        ("execution_model", "Execution Model"),
+        ("reflection_model", "Reflection Model"),
+    ):
+        value = getattr(loop_definition, attr, None)
+        if value:
+            rows.append((label, value))
     
     # 能力列表
     if loop_definition.capabilities:
         caps_str = ", ".join(loop_definition.capabilities[:5])
         if len(loop_definition.capabilities) > 5:
             caps_str += f", ... (+{len(loop_definition.capabilities) - 5} more)"
-        table.add_row("Capabilities", caps_str)
+        rows.append(("Capabilities", caps_str))
     
     # 运行时配置
     if hasattr(loop_definition, 'max_iterations'):
-        table.add_row("Max Iterations", str(loop_definition.max_iterations))
-    if hasattr(loop_definition, 'enable_replanning'):
-        table.add_row("Enable Replanning", "✓" if loop_definition.enable_replanning else "✗")
-    if hasattr(loop_definition, 'enable_reflection'):
-        table.add_row("Enable Reflection", "✓" if loop_definition.enable_reflection else "✗")
-    if hasattr(loop_definition, 'enable_validation'):
-        table.add_row("Enable Validation", "✓" if loop_definition.enable_validation else "✗")
+        rows.append(("Max Iterations", str(loop_definition.max_iterations)))
+    for attr, label in (
+        ("enable_replanning", "Enable Replanning"),
+        ("enable_reflection", "Enable Reflection"),
+        ("enable_validation", "Enable Validation"),
+    ):
+        if hasattr(loop_definition, attr):
+            rows.append((label, "✓" if getattr(loop_definition, attr) else "✗"))
+    
+    for row in rows:
+        table.add_row(*row)
     
     console.print("\n")
     console.print(table)
@@ -96,13 +110,7 @@ def display_task_tree(tree: TaskTree) -> None:
     
     # 按照执行顺序展示任务
     for i, task in enumerate(tree.tasks.values(), 1):
-        status_icon = {
-            TaskStatus.PENDING: "⏸️",
-            TaskStatus.RUNNING: "▶️",
-            TaskStatus.COMPLETED: "✅",
-            TaskStatus.FAILED: "❌",
-            TaskStatus.BLOCKED: "🚫"
-        }.get(task.status, "❓")
+        status_icon = _STATUS_ICONS.get(task.status, "❓")
         
         task_branch = rich_tree.add(
             f"{status_icon} [{i}] {task.task_description}"
@@ -110,21 +118,14 @@ def display_task_tree(tree: TaskTree) -> None:
         
         # 添加任务详情
         if task.task_detail_info:
-            detail = task.task_detail_info[:100]
-            if len(task.task_detail_info) > 100:
-                detail += "..."
-            task_branch.add(f"[dim]Details: {detail}[/dim]")
+            task_branch.add(f"[dim]Details: {task.display_detail}[/dim]")
         
-        if task.metadata.get("capability"):
-            task_branch.add(
-                f"[cyan]Capability:[/cyan] {task.metadata['capability']}"
-            )
+        capability = task.metadata.get("capability")
+        if capability:
+            task_branch.add(f"[cyan]Capability:[/cyan] {capability}")
         
         if task.dependencies:
-            deps_str = ", ".join(task.dependencies[:3])
-            if len(task.dependencies) > 3:
-                deps_str += f", ... (+{len(task.dependencies) - 3} more)"
-            task_branch.add(f"[yellow]Dependencies:[/yellow] {deps_str}")
+            task_branch.add(f"[yellow]Dependencies:[/yellow] {task.display_dependencies}")
     
     console.print("\n")
     console.print(Panel(rich_tree, title="📊 Execution Plan", box=box.ROUNDED))
@@ -149,7 +150,7 @@ def display_context_state(context_state: ContextState) -> None:
     table.add_column("Value", style="white", justify="right")
     
     table.add_row("Current Round", str(context_state.current_round))
-    table.add_row("Total Messages", str(len(context_state.messages)))
+    table.add_row("Total Messages", str(context_state.get_message_count()))
     table.add_row("Total Tokens", f"{context_state.total_tokens:,}")
     table.add_row("Compressions", str(context_state.compression_count))
     
@@ -157,12 +158,12 @@ def display_context_state(context_state: ContextState) -> None:
     console.print(table)
     
     # 展示最近的消息
-    if context_state.messages:
-        recent_messages = context_state.messages[-3:]
+    recent_dumps = context_state.get_recent_message_dumps()
+    if recent_dumps:
         # 使用 context_display 模块的函数
         if hasattr(context_display, 'display_messages'):
             context_display.display_messages(
-                [msg.model_dump() for msg in recent_messages],
+                recent_dumps,
                 title="Recent Messages (Last 3)",
                 max_content_length=150
             )
@@ -198,19 +199,24 @@ def display_execution_summary(
     table.add_column("Metric", style="cyan")
     table.add_column("Value", style="white")
     
-    table.add_row("Total Iterations", str(iterations))
-    table.add_row("Duration", f"{duration:.2f}s")
+    rows = [
+        ("Total Iterations", str(iterations)),
+        ("Duration", f"{duration:.2f}s"),
+    ]
     
     # 任务统计
     if task_stats:
-        table.add_row("Tasks Planned", str(task_stats.get('total_tasks', 0)))
-        table.add_row("Tasks Completed", str(task_stats.get('completed', 0)))
-        table.add_row("Tasks Failed", str(task_stats.get('failed', 0)))
+        rows.append(("Tasks Planned", str(task_stats.get('total_tasks', 0))))
+        rows.append(("Tasks Completed", str(task_stats.get('completed', 0))))
+        rows.append(("Tasks Failed", str(task_stats.get('failed', 0))))
     
     # 观测统计
     if observability_stats:
-        table.add_row("Phases Tracked", str(observability_stats.get('phases', 0)))
-        table.add_row("Traces Recorded", str(observability_stats.get('traces', 0)))
+        rows.append(("Phases Tracked", str(observability_stats.get('phases', 0))))
+        rows.append(("Traces Recorded", str(observability_stats.get('traces', 0))))
+    
+    for row in rows:
+        table.add_row(*row)
     
     console.print(table)
     console.print("=" * 80 + "\n")
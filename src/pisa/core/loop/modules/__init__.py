@@ -6,13 +6,23 @@ Agent Loop 的功能模块。
 
 from .base import (
     BaseModule,
+    CachedExecuteMixin,
+    ModulePool,
+    ModuleSignal,
+    RetryableError,
+    ReplanSignal,
     ModuleConfig,
     PlanningModuleConfig,
     ExecutionModuleConfig,
     ReflectionModuleConfig,
     ValidationModuleConfig,
 )
-from .execution import ExecutionModule, CapabilityCallRequest, CapabilityCallResult
+from .execution import (
+    ExecutionModule,
+    CapabilityCallRequest,
+    CapabilityCallResult,
+    CapabilityExecutionError,
+)
 from .planning import PlanningModule
 from .reflection import ReflectionModule, ReflectionResult
 from .validation import ValidationModule
@@ -31,6 +41,11 @@ from .observe import (
 __all__ = [
     # Base
     "BaseModule",
+    "CachedExecuteMixin",
+    "ModulePool",
+    "ModuleSignal",
+    "RetryableError",
+    "ReplanSignal",
     "ModuleConfig",
     "PlanningModuleConfig",
     "ExecutionModuleConfig",
@@ -40,6 +55,7 @@ __all__ = [
     "ExecutionModule",
     "CapabilityCallRequest",
     "CapabilityCallResult",
+    "CapabilityExecutionError",
     "PlanningModule",
     "ReflectionModule",
     "ReflectionResult",
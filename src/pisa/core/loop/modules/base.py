@@ -10,8 +10,16 @@ Agent Loop 模块基类，实现统一的 State → State 接口
 4. 不可变：每次返回新State
 """
 
+import asyncio
+import copy
+import json
 import logging
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
+import sys
+import time
+from collections import OrderedDict, deque
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Callable, Mapping, Dict, Any, Optional, Sequence, Tuple, TYPE_CHECKING
 from abc import ABC, abstractmethod
 from pydantic import BaseModel, Field
 from datetime import datetime
@@ -26,6 +34,73 @@ from pisa.utils.observability import ObservabilityManager, MetricsCollector
 
 _logger = logging.getLogger(__name__)
 
+# display_context_content 直接展示的最大节点数，超出时只展示摘要
+DISPLAY_MAX_NODES = 200
+
+# _update_state 中区分"字段不存在"与"值为 None"
+_MISSING = object()
+
+# 每个指标默认保留的最大样本数（可通过 config.metadata["metric_buffer"] 调整）
+DEFAULT_METRIC_BUFFER = 4096
+
+
+def _skip_state_validation(_self: Any, _state: Any) -> None:
+    """STATE_REQUIRES 为空的模块使用的 _validate_state"""
+
+
+def _exceeds_node_limit(data: Any, limit: int) -> bool:
+    """
+    判断嵌套的 dict/list 结构节点数是否超过上限
+    
+    计数达到上限即停止遍历，成本与 limit 相关而与数据总量无关：
+    栈中保存各层容器的迭代器，逐个取子节点而不展开整个容器。
+    """
+    count = 0
+    stack = [iter((data,))]
+    while stack:
+        item = next(stack[-1], _MISSING)
+        if item is _MISSING:
+            stack.pop()
+            continue
+        count += 1
+        if count > limit:
+            return True
+        if isinstance(item, dict):
+            stack.append(iter(item.values()))
+        elif isinstance(item, (list, tuple)):
+            stack.append(iter(item))
+    return False
+
+
+# ModuleConfig.metadata 未设置时 get_metadata() 返回的只读空映射
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+# _execute 返回值中表示 metadata 增量更新的键（见 BaseModule._update_state）
+METADATA_PATCH_KEY = "metadata_patch"
+
+
+# ==================== 控制流信号 ====================
+
+class ModuleSignal(Exception):  # noqa: N818 - 控制流信号而非错误，不使用 Error 后缀
+    """
+    模块控制流信号基类
+    
+    用于模块主动通知Loop进行重试、重新规划等预期内的流程跳转，
+    不代表程序错误，BaseModule.__call__ 对其只计数不记录错误日志。
+    """
+
+
+class RetryableError(ModuleSignal):
+    """可重试的暂时性失败（如外部服务超时）"""
+
+
+class ReplanSignal(ModuleSignal):
+    """请求重新规划当前任务"""
+
+
+# 预期内的控制流异常（所有 ModuleSignal 子类），在 __call__ 中走轻量路径
+_EXPECTED_EXCEPTIONS = (ModuleSignal,)
+
 
 # ==================== 模块配置类 ====================
 
@@ -42,13 +117,45 @@ class ModuleConfig(BaseModel):
     # 可观测性配置
     enable_logging: bool = Field(default=True, description="是否启用日志")
     enable_metrics: bool = Field(default=True, description="是否启用指标收集")
+    enable_display: bool = Field(
+        default=False, description="是否展示 context 内容（display_context_content）"
+    )
+    
+    # 结果缓存配置（仅对使用 CachedExecuteMixin 的模块生效）
+    cache_ttl: Optional[float] = Field(
+        default=300.0, description="_execute 结果缓存有效期（秒），None 表示不过期"
+    )
+    cache_max_entries: int = Field(default=256, description="_execute 结果缓存的最大条目数")
     
     # 元数据
     module_name: Optional[str] = Field(default=None, description="模块名称")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="额外元数据")
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None, description="额外元数据（首次写入时才分配）"
+    )
     
     class Config:
         extra = "allow"  # 允许额外字段
+    
+    def get_metadata(self) -> Mapping[str, Any]:
+        """
+        读取元数据（未设置时返回共享的只读空映射）
+        
+        Returns:
+            元数据映射
+        """
+        return self.metadata if self.metadata is not None else _EMPTY_METADATA
+    
+    def set_metadata(self, key: str, value: Any) -> None:
+        """
+        写入一项元数据（首次写入时分配字典）
+        
+        Args:
+            key: 键
+            value: 值
+        """
+        if self.metadata is None:
+            self.metadata = {}
+        self.metadata[key] = value
 
 
 class ObserveModuleConfig(ModuleConfig):
@@ -72,6 +179,14 @@ class ObserveModuleConfig(ModuleConfig):
     base_retry_delay: float = Field(default=1.0, description="基础重试延迟（秒）")
     max_retry_delay: float = Field(default=60.0, description="最大重试延迟（秒）")
     exponential_backoff: bool = Field(default=True, description="是否使用指数退避")
+    
+    # 并发控制
+    max_concurrent_llm: int = Field(
+        default=4, ge=1, description="批量观察时并发根因分析的最大 LLM 调用数"
+    )
+    
+    # 历史记录
+    history_window: int = Field(default=256, ge=1, description="观察/决策历史保留条数")
 
 
 class PlanningModuleConfig(ModuleConfig):
@@ -80,6 +195,12 @@ class PlanningModuleConfig(ModuleConfig):
     replanning_model: Optional[str] = Field(default=None, description="重规划专用模型")
     max_planning_iterations: int = Field(default=10, description="最大规划迭代次数")
     enable_replanning: bool = Field(default=True, description="是否启用重新规划")
+    max_parallel_replans: int = Field(
+        default=3, ge=1, description="并发重规划时的最大同时 LLM 调用数"
+    )
+    plan_cache_size: int = Field(
+        default=0, ge=0, description="相同目标/能力/上下文的计划缓存条数（0 表示不缓存）"
+    )
 
 
 class ExecutionModuleConfig(ModuleConfig):
@@ -88,6 +209,9 @@ class ExecutionModuleConfig(ModuleConfig):
     max_retries: int = Field(default=3, description="最大重试次数")
     timeout_seconds: Optional[int] = Field(default=None, description="超时时间（秒）")
     parallel_execution: bool = Field(default=False, description="是否并行执行")
+    max_concurrency: int = Field(default=8, ge=1, description="批量执行时的最大并发调用数")
+    io_workers: int = Field(default=16, ge=1, description="I/O型同步调用（MCP、agent）的线程数")
+    cpu_workers: int = Field(default=4, ge=1, description="计算型同步函数调用的线程数")
 
 
 class ReflectionModuleConfig(ModuleConfig):
@@ -141,9 +265,55 @@ class BaseModule(ABC):
     ```
     """
     
+    # 基类实例属性使用 slot 存储；子类未声明 __slots__ 时仍保留 __dict__，
+    # 可自由添加属性
+    __slots__ = (
+        "_created_monotonic",
+        "_created_wall",
+        "_display_enabled",
+        "_errors_count",
+        "_initialized",
+        "_is_running",
+        "_log_enabled",
+        "_metric_samples",
+        "_metrics_enabled",
+        "_operations_count",
+        "_success_log_base",
+        "_success_log_msg",
+        "config",
+        "context",
+        "logger",
+        "loop",
+        "model",
+        "module_type",
+        "state_ref",
+        "stats",
+    )
+    
     # 子类必须声明State依赖
-    STATE_REQUIRES: List[str] = []  # 需要从State读取的字段
-    STATE_PRODUCES: List[str] = []  # 会写入State的字段
+    # 子类可用 list 声明，__init_subclass__ 会冻结为 intern 过的 tuple
+    STATE_REQUIRES: Sequence[str] = ()  # 需要从State读取的字段
+    STATE_PRODUCES: Sequence[str] = ()  # 会写入State的字段
+    
+    # 由 __init_subclass__ 根据 STATE_REQUIRES 预先生成
+    _require_checks: Tuple = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        """子类创建时冻结依赖声明并预先生成必需字段的访问器"""
+        super().__init_subclass__(**kwargs)
+        cls.STATE_REQUIRES = tuple(sys.intern(f) for f in cls.STATE_REQUIRES)
+        cls.STATE_PRODUCES = tuple(sys.intern(f) for f in cls.STATE_PRODUCES)
+        cls._require_checks = tuple(
+            (field, attrgetter(field)) for field in cls.STATE_REQUIRES
+        )
+        
+        # 按子类特化 _validate_state（未被子类自定义时）：
+        # 无必需字段时直接绑定空实现，__call__ 不再进入校验循环
+        if cls._validate_state in (BaseModule._validate_state, _skip_state_validation):
+            cls._validate_state = (
+                BaseModule._validate_state if cls._require_checks
+                else _skip_state_validation
+            )
     
     def __init__(
         self,
@@ -174,18 +344,38 @@ class BaseModule(ABC):
         self.state_ref = loop_state  # 可选的State引用（用于访问全局状态）
         self.loop = loop  # BaseAgentLoop 引用（用于 create_agent 等）
         
-        # 确保 Agent SDK 已配置
+        # 确保 Agent SDK 已配置（已配置时 setup_agent_sdk 立即返回）
         Config.setup_agent_sdk()
         
         # 模型配置
         self.model = self._resolve_model()
         
-        # 可观测性
+        # 可观测性（get_logger 返回进程级单例，setup_logger 可替换它，
+        # 因此每次构造都经由 get_logger 获取而不在模块类上另行缓存）
         self.logger = get_logger(enable_rich=self.config.enable_logging)
         
-        # 统计信息
+        # 热路径上读取的配置开关快照为普通属性
+        self._log_enabled = self.config.enable_logging
+        self._metrics_enabled = self.config.enable_metrics
+        self._display_enabled = self._log_enabled and self.config.enable_display
+        
+        # 成功日志的不变部分预先构建
+        self._success_log_msg = f"{module_type}.execute"
+        self._success_log_base = {
+            "module": module_type,
+            "operation": "execute",
+            "status": "success",
+        }
+        
+        # 统计信息（调用/错误计数用整数属性，避免每次调用的字典查找）
         self.stats = self._init_stats()
-        self.created_at = datetime.now()
+        self._operations_count = 0
+        self._errors_count = 0
+        # 指标样本：metric_key → deque[(time_ns, value, tags)]
+        self._metric_samples: Dict[str, deque] = {}
+        # 记录单调时钟用于计算运行时长，墙上时间仅在访问 created_at 时转换
+        self._created_monotonic = time.monotonic()
+        self._created_wall = time.time()
         
         # 生命周期状态
         self._initialized = False
@@ -218,13 +408,15 @@ class BaseModule(ABC):
         
         Raises:
             ValueError: 如果State缺少必需字段
+            ModuleSignal: 模块发出的控制流信号（原样抛出）
         """
         # 1. 验证State包含所需字段
         self._validate_state(state)
+        iteration = state.iteration
         
         # 2. 记录操作开始
         self._is_running = True
-        self.stats["operations_count"] = self.stats.get("operations_count", 0) + 1
+        self._operations_count += 1
         
         try:
             # 3. 执行业务逻辑（子类实现）
@@ -233,23 +425,27 @@ class BaseModule(ABC):
             # 4. 更新State（不可变）
             new_state = self._update_state(state, result)
             
-            # 5. 记录成功
-            self.log_operation(
-                operation="execute",
-                status="success",
-                iteration=state.iteration
-            )
+            # 5. 记录成功（推迟到事件循环下一轮，调用方可立即拿到新State；
+            #    错误日志保持同步，以保证与异常抛出的顺序）
+            if self._log_enabled:
+                asyncio.get_running_loop().call_soon(
+                    self._log_execute_success, iteration
+                )
             
             return new_state
             
+        except _EXPECTED_EXCEPTIONS:
+            # 预期信号：仅计数，不格式化错误信息也不写日志
+            self._errors_count += 1
+            raise
         except Exception as e:
             # 记录错误
-            self.stats["errors_count"] = self.stats.get("errors_count", 0) + 1
+            self._errors_count += 1
             self.log_operation(
                 operation="execute",
                 status="error",
                 error=str(e),
-                iteration=state.iteration
+                iteration=iteration
             )
             raise
         finally:
@@ -265,8 +461,12 @@ class BaseModule(ABC):
         Raises:
             ValueError: 如果缺少必需字段
         """
-        for field in self.STATE_REQUIRES:
-            if getattr(state, field, None) is None:
+        for field, get_field in self._require_checks:
+            try:
+                value = get_field(state)
+            except AttributeError:
+                value = None
+            if value is None:
                 raise ValueError(
                     f"{self.__class__.__name__} requires state.{field}, "
                     f"but it's None or missing"
@@ -321,13 +521,32 @@ class BaseModule(ABC):
         """
         更新State（不可变）
         
+        result 中的 "metadata_patch" 是对 state.metadata 的增量更新，
+        在这里与现有 metadata 合并，模块无需自行复制整个 metadata。
+        
         Args:
             state: 输入State
-            result: 要更新的字段
+            result: 要更新的字段（可包含 metadata_patch）
         
         Returns:
             新的State对象
         """
+        if METADATA_PATCH_KEY in result:
+            result = dict(result)
+            patch = result.pop(METADATA_PATCH_KEY)
+            if patch:
+                base = result.get("metadata", state.metadata)
+                result["metadata"] = {**base, **patch}
+        
+        # 无更新或所有值与当前State相同（同一对象）时，直接复用原State
+        if not result:
+            return state
+        for key, value in result.items():
+            if getattr(state, key, _MISSING) is not value:
+                break
+        else:
+            return state
+        
         # 使用State的不可变更新
         return state.with_update(**result)
     
@@ -346,9 +565,19 @@ class BaseModule(ABC):
             模型名称
         """
         # 子类可以覆盖此方法提供更具体的模型解析逻辑
-        if self.config.model:
-            return self.config.model
-        return Config.agent_default_model
+        # 结果在 __init__ 中保存为 self.model，运行期间不会重复解析
+        return self.config.model or Config.agent_default_model
+    
+    @property
+    def created_at(self) -> datetime:
+        """模块创建时间"""
+        # 与此前 datetime.now() 一致返回本地时间的 naive datetime
+        return datetime.fromtimestamp(self._created_wall)  # noqa: DTZ006
+    
+    @property
+    def is_running(self) -> bool:
+        """模块是否正在执行 __call__"""
+        return self._is_running
     
     # ==================== 统计信息 ====================
     
@@ -361,8 +590,6 @@ class BaseModule(ABC):
         """
         return {
             "module_type": self.module_type,
-            "operations_count": 0,
-            "errors_count": 0,
             "initialized": False,
         }
     
@@ -376,17 +603,68 @@ class BaseModule(ABC):
         base_stats = {
             "module_type": self.module_type,
             "model": self.model,
-            "uptime_seconds": (datetime.now() - self.created_at).total_seconds(),
+            "uptime_seconds": time.monotonic() - self._created_monotonic,
             "is_running": self._is_running,
+            "operations_count": self._operations_count,
+            "errors_count": self._errors_count,
         }
         
+        # 指标样本在此才转换为带 ISO 时间戳的字典
+        # （与此前 datetime.now().isoformat() 一致，为不带时区的本地时间）
+        for metric_key, samples in self._metric_samples.items():
+            base_stats[metric_key] = [
+                {
+                    "value": value,
+                    "timestamp": datetime.fromtimestamp(ts_ns / 1e9).isoformat(),  # noqa: DTZ006
+                    "tags": tags,
+                }
+                for ts_ns, value, tags in samples
+            ]
+        
         return {**base_stats, **self.stats}
     
     def reset_statistics(self) -> None:
         """重置统计信息"""
         self.stats = self._init_stats()
+        self._operations_count = 0
+        self._errors_count = 0
+        self._metric_samples = {}
         self.logger.info(f"{self.module_type} statistics reset")
     
+    def reset_for_reuse(
+        self,
+        loop_context: Optional['LoopContext'] = None,
+        loop_state: Optional['LoopState'] = None
+    ) -> None:
+        """
+        重置模块以便复用（供 ModulePool 使用）
+        
+        保留 config、logger、model 等构造开销较大的部分，重置统计和
+        生命周期状态，并重新绑定共享的 Context/State。子类自身的运行时
+        状态由 _reset_module_state() 清理。
+        
+        Args:
+            loop_context: 新的 LoopContext
+            loop_state: 新的 LoopState
+        """
+        self.context = loop_context
+        self.state_ref = loop_state
+        self.stats = self._init_stats()
+        self._operations_count = 0
+        self._errors_count = 0
+        self._metric_samples = {}
+        self._initialized = False
+        self._is_running = False
+        self._reset_module_state()
+    
+    def _reset_module_state(self) -> None:  # noqa: B027 - 可选钩子，默认无状态可清理
+        """
+        清理子类的运行时状态（供 reset_for_reuse 调用）
+        
+        持有历史记录、当前计划或结果缓存等跨调用状态的子类需要覆盖此方法，
+        避免上一次使用的状态泄漏到下一次；构造参数决定的配置应保留。
+        """
+    
     # ==================== 可观测性方法 ====================
     
     def log_operation(
@@ -403,7 +681,7 @@ class BaseModule(ABC):
             status: 状态（success/error/running）
             **kwargs: 额外的日志字段
         """
-        if not self.config.enable_logging:
+        if not self._log_enabled:
             return
         
         log_data = {
@@ -418,6 +696,17 @@ class BaseModule(ABC):
         else:
             self.logger.info(f"{self.module_type}.{operation}", **log_data)
     
+    def _log_execute_success(self, iteration: int) -> None:
+        """
+        记录 execute 成功日志（使用预构建的日志模板）
+        
+        Args:
+            iteration: 当前迭代次数
+        """
+        log_data = self._success_log_base.copy()
+        log_data["iteration"] = iteration
+        self.logger.info(self._success_log_msg, **log_data)
+    
     def log_context_update(
         self,
         action: str,
@@ -430,7 +719,7 @@ class BaseModule(ABC):
             action: 更新动作
             details: 详细信息
         """
-        if not self.config.enable_logging:
+        if not self._log_enabled:
             return
         
         self.logger.context_update(
@@ -450,11 +739,18 @@ class BaseModule(ABC):
             context_data: Context 数据
             title: 标题
         """
-        if not self.config.enable_logging:
+        if not self._display_enabled:
             return
         
         display_title = title or f"{self.module_type} Context"
         
+        # 过大的结构（如完整 LLM 消息历史）只展示顶层摘要
+        if _exceeds_node_limit(context_data, DISPLAY_MAX_NODES):
+            context_data = {
+                key: f"<{type(value).__name__} …>"
+                for key, value in context_data.items()
+            }
+        
         # 使用 logger 的 display_config 方法展示结构化数据
         self.logger.display_config(context_data, title=display_title)
     
@@ -472,19 +768,17 @@ class BaseModule(ABC):
             value: 指标值
             **tags: 标签
         """
-        if not self.config.enable_metrics:
+        if not self._metrics_enabled:
             return
         
-        # 记录到统计信息
+        # 记录原始样本（有界），时间戳格式化推迟到 get_statistics
         metric_key = f"metric_{metric_name}"
-        if metric_key not in self.stats:
-            self.stats[metric_key] = []
+        samples = self._metric_samples.get(metric_key)
+        if samples is None:
+            maxlen = self.config.get_metadata().get("metric_buffer", DEFAULT_METRIC_BUFFER)
+            samples = self._metric_samples[metric_key] = deque(maxlen=maxlen)
         
-        self.stats[metric_key].append({
-            "value": value,
-            "timestamp": datetime.now().isoformat(),
-            "tags": tags
-        })
+        samples.append((time.time_ns(), value, tags))
     
     # ==================== 生命周期方法 ====================
     
@@ -519,3 +813,214 @@ class BaseModule(ABC):
         """支持上下文管理器"""
         self.shutdown()
         return False
+
+
+# ==================== 结果缓存 ====================
+
+def _cache_key_part(value: Any) -> str:
+    """将 State 字段值转换为稳定的缓存键片段"""
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    try:
+        return json.dumps(value, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+class CachedExecuteMixin:
+    """
+    _execute 结果缓存混入类（可选）
+    
+    按 (module_type, model, STATE_REQUIRES 字段值) 精确匹配缓存 _execute 的结果，
+    适用于对相同输入会重复调用 LLM 的模块。
+    并发的相同请求只会触发一次 _execute，其余等待同一结果。
+    STATE_REQUIRES 为空时缓存键与输入无关，定义这样的子类会直接报错。
+    
+    只适用于 _execute 为纯函数的模块：结果只取决于 STATE_REQUIRES 字段，
+    且不修改模块自身状态。命中缓存时 _execute 不会运行，其中追加历史、
+    更新统计等副作用也会被跳过，因此不要用于 ObserveModule 这类会累积
+    观察历史的模块。每个调用方拿到的都是结果的深拷贝，修改返回值不会
+    影响缓存或其他调用方。
+    
+    缓存大小和有效期由 ModuleConfig.cache_max_entries / cache_ttl 控制。
+    
+    使用示例：
+    ```python
+    class SummaryModule(CachedExecuteMixin, BaseModule):
+        STATE_REQUIRES = ['input']
+        STATE_PRODUCES = ['result']
+        
+        async def _execute(self, state):
+            return {"result": await summarize(state.input)}
+    ```
+    """
+    
+    __slots__ = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        """拒绝 STATE_REQUIRES 为空的模块：所有输入会共用同一个缓存键"""
+        super().__init_subclass__(**kwargs)
+        if not getattr(cls, "STATE_REQUIRES", None):
+            raise TypeError(
+                f"{cls.__name__} uses CachedExecuteMixin but declares no STATE_REQUIRES; "
+                f"every input would share one cache entry"
+            )
+    
+    def _execute_cache_key(self, state: 'LoopState') -> str:
+        """
+        计算缓存键
+        
+        Args:
+            state: 输入State
+        
+        Returns:
+            缓存键字符串
+        """
+        parts = [self.module_type, str(self.model)]
+        for field in self.STATE_REQUIRES:
+            parts.append(_cache_key_part(getattr(state, field, None)))
+        return "\x1f".join(parts)
+    
+    async def _execute(self, state: 'LoopState') -> Dict[str, Any]:
+        """带缓存的 _execute"""
+        try:
+            cache = self._execute_cache
+            inflight = self._execute_inflight
+        except AttributeError:
+            cache = self._execute_cache = OrderedDict()
+            inflight = self._execute_inflight = {}
+        
+        key = self._execute_cache_key(state)
+        now = time.monotonic()
+        
+        # 1. 命中缓存
+        entry = cache.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at is None or expires_at > now:
+                cache.move_to_end(key)
+                return copy.deepcopy(result)
+            del cache[key]
+        
+        # 2. 相同请求正在执行，等待其结果
+        pending = inflight.get(key)
+        if pending is not None:
+            return copy.deepcopy(await asyncio.shield(pending))
+        
+        # 3. 未命中，执行并缓存
+        future = asyncio.get_running_loop().create_future()
+        inflight[key] = future
+        try:
+            result = await super()._execute(state)
+            # 缓存与等待者共享的副本和返回给本调用方的结果互不关联；
+            # 复制失败同样要通知等待者，否则它们会一直挂起
+            cached = copy.deepcopy(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 避免无人等待时出现 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            inflight.pop(key, None)
+        
+        future.set_result(cached)
+        
+        ttl = self.config.cache_ttl
+        cache[key] = (None if ttl is None else now + ttl, cached)
+        while len(cache) > self.config.cache_max_entries:
+            cache.popitem(last=False)
+        
+        return result
+    
+    def _reset_module_state(self) -> None:
+        """复用时丢弃结果缓存"""
+        super()._reset_module_state()
+        self.__dict__.pop("_execute_cache", None)
+        self.__dict__.pop("_execute_inflight", None)
+
+
+# ==================== 模块对象池 ====================
+
+class ModulePool:
+    """
+    模块对象池（可选）
+    
+    用于批量/仿真场景中频繁创建和丢弃的模块（如 reflector、observer），
+    通过 reset_for_reuse() 原地重置来避免重复构造的开销。有跨调用状态的
+    模块需实现 _reset_module_state()，否则上一次使用的状态会带入下一次。
+    
+    使用示例：
+    ```python
+    pool = ModulePool(lambda: ReflectionModule(config), max_size=8)
+    
+    module = pool.acquire(loop_context=context, loop_state=state)
+    try:
+        new_state = await module(state)
+    finally:
+        pool.release(module)
+    ```
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[], BaseModule],
+        max_size: int = 8
+    ):
+        """
+        初始化对象池
+        
+        Args:
+            factory: 创建新模块实例的工厂函数
+            max_size: 池中最多保留的空闲实例数
+        """
+        self._factory = factory
+        self._max_size = max_size
+        self._idle: deque = deque()
+    
+    def acquire(
+        self,
+        loop_context: Optional['LoopContext'] = None,
+        loop_state: Optional['LoopState'] = None
+    ) -> BaseModule:
+        """
+        获取一个模块实例（优先复用空闲实例）
+        
+        Args:
+            loop_context: 要绑定的 LoopContext
+            loop_state: 要绑定的 LoopState
+        
+        Returns:
+            已重置并绑定 Context/State 的模块实例
+        """
+        if self._idle:
+            module = self._idle.pop()
+        else:
+            module = self._factory()
+        module.reset_for_reuse(loop_context, loop_state)
+        return module
+    
+    def release(self, module: BaseModule) -> None:
+        """
+        归还模块实例
+        
+        池已满时直接丢弃。
+        
+        Args:
+            module: 要归还的模块实例
+        
+        Raises:
+            ValueError: 如果模块仍在运行
+        """
+        if module.is_running:
+            raise ValueError(
+                f"Cannot release {module.module_type} while it is running"
+            )
+        if len(self._idle) < self._max_size:
+            self._idle.append(module)
+    
+    def __len__(self) -> int:
+        """空闲实例数量"""
+        return len(self._idle)
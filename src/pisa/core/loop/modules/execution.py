@@ -12,10 +12,17 @@ Execution Module (Refactored v4.0)
 继承 BaseModule，支持配置透传和可观测性。
 """
 
+import functools
+import inspect
+import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+import uuid
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union, TYPE_CHECKING
 from datetime import datetime
 
 if TYPE_CHECKING:
@@ -23,11 +30,154 @@ if TYPE_CHECKING:
     from pisa.core.loop.context import LoopContext
 
 from pisa.capability import CapabilityRegistry, Capability, get_global_registry
-from .base import BaseModule, ExecutionModuleConfig
+from .base import BaseModule, ExecutionModuleConfig, RetryableError, METADATA_PATCH_KEY
+
+# OpenAI Agent SDK 为可选依赖，在模块加载时导入一次
+try:
+    from agents import Runner
+    from agents.tool import FunctionTool
+    from agents.tool_context import ToolContext
+    _HAS_AGENTS_SDK = True
+except ImportError:
+    Runner = None
+    FunctionTool = None
+    ToolContext = None
+    _HAS_AGENTS_SDK = False
+
+# orjson 为可选加速依赖，未安装时使用标准库 json
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    _json_dumps = json.dumps
 
 _logger = logging.getLogger(__name__)
 
 
+# OpenAI Agent SDK 的 FunctionTool 出错时不抛异常，而是返回以此开头的消息
+# （参数 JSON 无效也会经由同一错误处理函数返回）
+_SDK_TOOL_ERROR_PREFIXES = (
+    "An error occurred while running the tool",
+    "Invalid JSON input",
+)
+
+
+class CapabilityExecutionError(Exception):
+    """
+    capability 正常返回，但返回值表示执行失败
+    
+    由 _execute_* 在识别到错误结果时抛出，execute() 将其转为失败的
+    CapabilityCallResult，并保留原始返回值。
+    """
+    
+    def __init__(self, error: Any, result: Any = None):
+        super().__init__(str(error))
+        self.error = error
+        self.result = result
+
+
+def _required_params(func: Any, is_function_tool: bool) -> FrozenSet[str]:
+    """
+    获取 function capability 调用时必须提供的参数名
+    
+    普通函数取签名中没有默认值的参数。FunctionTool 无法取得原函数签名，
+    只在非 strict schema 下使用其 required 列表：strict 模式的 schema 会把
+    带默认值的参数也列为 required。无法确定时返回空集合（不做预校验）。
+    """
+    if is_function_tool:
+        schema = getattr(func, "params_json_schema", None)
+        if getattr(func, "strict_json_schema", True) or not isinstance(schema, dict):
+            return frozenset()
+        required = schema.get("required")
+        return frozenset(required) if isinstance(required, list) else frozenset()
+    
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        return frozenset()
+    return frozenset(
+        name for name, param in signature.parameters.items()
+        if param.default is inspect.Parameter.empty
+        and param.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    )
+
+
+def _raise_on_error_result(result: Any) -> None:
+    """
+    检查返回值是否表示失败（dict 中 success=False 或含 error 字段）
+    
+    Raises:
+        CapabilityExecutionError: 如果返回值表示失败
+    """
+    if isinstance(result, dict) and (not result.get("success", True) or result.get("error")):
+        raise CapabilityExecutionError(result.get("error", str(result)), result)
+
+
+def _new_call_id() -> str:
+    """生成调用 ID（同一毫秒内的并发调用也不会重复）"""
+    return f"call_{uuid.uuid4().hex[:12]}"
+
+# 重试退避参数（秒）
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_JITTER = 0.5
+
+# 从任务描述映射主参数时的候选参数名（按优先级）
+_PARAM_PRIORITY = (
+    'requirement',  # 最高优先级
+    'query',
+    'input',
+    'text',
+    'content',
+    'prompt',
+    'message',
+)
+
+
+class _DispatchEntry(NamedTuple):
+    """capability 的调用信息（首次查询时反射得到，按名称缓存）"""
+    capability: Capability
+    func: Any
+    is_coroutine: bool
+    is_function_tool: bool
+    required_params: FrozenSet[str]
+
+
+class _ArgumentPlan(NamedTuple):
+    """capability 参数映射方案（由参数schema推导，不随任务变化）"""
+    primary: Optional[str]
+    has_data: bool
+    param_names: Tuple[str, ...]
+    fallback: str
+
+
+# 同步 capability 的共享线程池：(用途, 线程数) → 线程池，进程内所有 ExecutionModule 共用，
+# 临时创建后丢弃的模块（如 Temporal activity 中的）不会各自留下空闲线程
+_SHARED_EXECUTORS: Dict[Tuple[str, int], ThreadPoolExecutor] = {}
+_SHARED_EXECUTORS_LOCK = threading.Lock()
+
+
+def _shared_executor(kind: str, max_workers: int) -> ThreadPoolExecutor:
+    """获取（必要时创建）指定用途和线程数的共享线程池"""
+    key = (kind, max_workers)
+    executor = _SHARED_EXECUTORS.get(key)
+    if executor is None:
+        with _SHARED_EXECUTORS_LOCK:
+            executor = _SHARED_EXECUTORS.get(key)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix=f"pisa-exec-{kind}"
+                )
+                _SHARED_EXECUTORS[key] = executor
+    return executor
+
+
+# 可重试的暂时性异常（超时另行判断，见 ExecutionModule._is_recoverable）
+_RECOVERABLE_ERRORS = (ConnectionError, RetryableError)
+
 class CapabilityCallRequest(Dict):
     """
     Capability 调用请求
@@ -41,12 +191,12 @@ class CapabilityCallRequest(Dict):
         call_id: Optional[str] = None,
         **kwargs
     ):
-        super().__init__(
-            capability_name=capability_name,
-            arguments=arguments,
-            call_id=call_id or f"call_{int(time.time() * 1000)}",
-            **kwargs
-        )
+        # 直接写入键，避免 **kwargs 重新打包出的中间字典
+        self["capability_name"] = capability_name
+        self["arguments"] = arguments
+        self["call_id"] = call_id or _new_call_id()
+        if kwargs:
+            self.update(kwargs)
 
 
 class CapabilityCallResult(Dict):
@@ -66,16 +216,16 @@ class CapabilityCallResult(Dict):
         retries: int = 0,
         **kwargs
     ):
-        super().__init__(
-            call_id=call_id,
-            capability_name=capability_name,
-            success=success,
-            result=result,
-            error=error,
-            execution_time=execution_time,
-            retries=retries,
-            **kwargs
-        )
+        # 直接写入键，避免 **kwargs 重新打包出的中间字典
+        self["call_id"] = call_id
+        self["capability_name"] = capability_name
+        self["success"] = success
+        self["result"] = result
+        self["error"] = error
+        self["execution_time"] = execution_time
+        self["retries"] = retries
+        if kwargs:
+            self.update(kwargs)
 
 
 class ExecutionModule(BaseModule):
@@ -99,7 +249,8 @@ class ExecutionModule(BaseModule):
     # ==================== 依赖声明 ====================
     
     STATE_REQUIRES = ['task']  # 需要任务信息
-    STATE_PRODUCES = ['result', 'metadata']  # 产生执行结果和元数据
+    # 产生执行结果和元数据（metadata 通过 metadata_patch 增量更新）
+    STATE_PRODUCES = ['result', 'metadata']
     
     # ==================== 初始化 ====================
     
@@ -143,7 +294,30 @@ class ExecutionModule(BaseModule):
         
         self.registry = registry or get_global_registry()
         self.max_retries = max_retries or config.max_retries
-        self.timeout = timeout or config.timeout_seconds or 30.0
+        # 未配置时不限制单次调用时长（subagent 等调用可能合理地运行很久）
+        self.timeout = timeout or config.timeout_seconds
+        self.max_concurrency = getattr(config, "max_concurrency", 8)
+        
+        # 同步 capability 的专用线程池：I/O 型（MCP、agent）与计算型（函数）分开，
+        # 避免与应用中其他 run_in_executor 用户争用默认线程池（见 _shared_executor）
+        self._io_executor = _shared_executor("io", getattr(config, "io_workers", 16))
+        self._cpu_executor = _shared_executor("cpu", getattr(config, "cpu_workers", 4))
+        
+        # name → 调用信息，registry.version 变化时失效
+        self._dispatch_cache: Dict[str, _DispatchEntry] = {}
+        # name → 参数映射方案（见 _build_arguments_from_task）
+        self._arg_plan_cache: Dict[str, _ArgumentPlan] = {}
+        # registry 汇总信息（见 get_statistics / list_available_capabilities）
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._caps_list_cache: Optional[List[str]] = None
+        self._dispatch_version = self.registry.version
+        
+        # capability_type → 执行方法
+        self._dispatchers = {
+            "function": self._execute_function,
+            "agent": self._execute_agent,
+            "mcp": self._execute_mcp,
+        }
         
         self.logger.info(
             "ExecutionModule initialized",
@@ -177,7 +351,7 @@ class ExecutionModule(BaseModule):
             state: 输入State（需要task字段）
         
         Returns:
-            包含result和metadata的字典
+            包含result和metadata_patch的字典
         
         Example:
             state.task应包含:
@@ -258,11 +432,10 @@ class ExecutionModule(BaseModule):
                 content=f"Executed {capability_name}: {result.get('success')}"
             )
         
-        # 返回State更新
+        # 返回State更新（metadata 以增量形式返回，由基类合并）
         return {
             "result": result,
-            "metadata": {
-                **state.metadata,
+            METADATA_PATCH_KEY: {
                 "last_execution": {
                     "capability": capability_name,
                     "success": result.get("success", False),
@@ -293,14 +466,14 @@ class ExecutionModule(BaseModule):
         Returns:
             调用结果
         """
-        start_time = time.time()
-        call_id = call_id or f"call_{int(time.time() * 1000)}"
+        start_time = time.perf_counter()
+        call_id = call_id or _new_call_id()
         
         _logger.info(f"Executing capability: {capability_name} (call_id={call_id})")
         
         # 获取 capability
-        capability = self.registry.get(capability_name)
-        if capability is None:
+        entry = self._resolve_capability(capability_name)
+        if entry is None:
             error_msg = f"Capability '{capability_name}' not found"
             _logger.error(error_msg)
             return CapabilityCallResult(
@@ -308,76 +481,235 @@ class ExecutionModule(BaseModule):
                 capability_name=capability_name,
                 success=False,
                 error=error_msg,
-                execution_time=time.time() - start_time
+                execution_time=time.perf_counter() - start_time
             )
+        capability = entry.capability
         
-        # 根据类型执行
-        try:
-            if capability.capability_type == "function":
-                result = await self._execute_function(capability, arguments, **kwargs)
-            elif capability.capability_type == "agent":
-                # ⭐ 对于 agent 类型（subagent），传递 task_description
-                result = await self._execute_agent(capability, arguments, task_description=task_description, **kwargs)
-            elif capability.capability_type == "mcp":
-                result = await self._execute_mcp(capability, arguments, **kwargs)
-            else:
-                raise ValueError(f"Unknown capability type: {capability.capability_type}")
-            
-            execution_time = time.time() - start_time
-            
-            # 检查结果是否包含错误（OpenAI Agent SDK 不抛出异常，而是返回错误消息）
-            is_error = False
-            error_msg = None
-            
-            if isinstance(result, str):
-                # 如果结果是字符串，检查是否是错误消息
-                if "error occurred" in result.lower() or "invalid json input" in result.lower():
-                    is_error = True
-                    error_msg = result
-            elif isinstance(result, dict):
-                # 如果结果是字典，检查是否有 error 或 success=False 字段
-                if not result.get("success", True) or result.get("error"):
-                    is_error = True
-                    error_msg = result.get("error", str(result))
-            
-            if is_error:
-                _logger.error(
-                    f"Capability execution failed: {capability_name} - {error_msg}"
-                )
+        # 缺少必需参数时直接失败，不进入线程池或 Runner
+        if entry.required_params:
+            missing = entry.required_params.difference(arguments)
+            if missing:
+                error_msg = f"Missing required args: {sorted(missing)}"
+                _logger.error(f"{error_msg} (capability={capability_name})")
                 return CapabilityCallResult(
                     call_id=call_id,
                     capability_name=capability_name,
                     success=False,
                     error=error_msg,
-                    result=result,
-                    execution_time=execution_time
+                    execution_time=time.perf_counter() - start_time
                 )
-            
-            _logger.info(
-                f"Capability executed successfully: {capability_name} "
-                f"(time={execution_time:.2f}s)"
-            )
-            
-            return CapabilityCallResult(
-                call_id=call_id,
-                capability_name=capability_name,
-                success=True,
-                result=result,
-                execution_time=execution_time
-            )
-            
-        except Exception as e:
-            execution_time = time.time() - start_time
-            error_msg = f"Execution failed: {str(e)}"
-            _logger.error(f"{error_msg} (capability={capability_name})", exc_info=True)
-            
+        
+        # 按类型分发（subagent 使用 task_description 作为输入）
+        handler = self._dispatchers.get(capability.capability_type)
+        if handler is None:
+            error_msg = f"Execution failed: Unknown capability type: {capability.capability_type}"
+            _logger.error(f"{error_msg} (capability={capability_name})")
             return CapabilityCallResult(
                 call_id=call_id,
                 capability_name=capability_name,
                 success=False,
                 error=error_msg,
-                execution_time=execution_time
+                execution_time=time.perf_counter() - start_time
+            )
+        
+        # 单次调用超时：capability 自带的 timeout 优先，均未配置时不设超时
+        timeout = getattr(capability, "timeout", None) or self.timeout
+        
+        # 根据类型执行（暂时性失败按指数退避重试）
+        retries = 0
+        while True:
+            try:
+                call = handler(capability, arguments, task_description=task_description, **kwargs)
+                if timeout is None:
+                    result = await call
+                else:
+                    result = await asyncio.wait_for(call, timeout=timeout)
+                break
+                
+            except Exception as e:
+                if retries < self.max_retries and self._is_recoverable(entry, e):
+                    delay = self._retry_delay(retries)
+                    retries += 1
+                    self.stats["total_retries"] += 1
+                    _logger.warning(
+                        "Recoverable error in %s (attempt %d/%d), retrying in %.2fs: %s",
+                        capability_name, retries, self.max_retries, delay, e
+                    )
+                    # 非阻塞等待，批量中的其他调用继续执行
+                    await asyncio.sleep(delay)
+                    continue
+                
+                execution_time = time.perf_counter() - start_time
+                
+                if isinstance(e, CapabilityExecutionError):
+                    # capability 正常返回，但结果表示失败
+                    _logger.error(
+                        f"Capability execution failed: {capability_name} - {e.error}"
+                    )
+                    return CapabilityCallResult(
+                        call_id=call_id,
+                        capability_name=capability_name,
+                        success=False,
+                        error=e.error,
+                        result=e.result,
+                        execution_time=execution_time,
+                        retries=retries
+                    )
+                
+                error_msg = f"Execution failed: {str(e)}"
+                _logger.error(f"{error_msg} (capability={capability_name})", exc_info=True)
+                
+                return CapabilityCallResult(
+                    call_id=call_id,
+                    capability_name=capability_name,
+                    success=False,
+                    error=error_msg,
+                    execution_time=execution_time,
+                    retries=retries
+                )
+        
+        execution_time = time.perf_counter() - start_time
+        
+        _logger.info(
+            f"Capability executed successfully: {capability_name} "
+            f"(time={execution_time:.2f}s)"
+        )
+        
+        return CapabilityCallResult(
+            call_id=call_id,
+            capability_name=capability_name,
+            success=True,
+            result=result,
+            execution_time=execution_time,
+            retries=retries
+        )
+    
+    def _sync_registry_caches(self) -> None:
+        """registry 注册或清空后丢弃按 capability 名称缓存的信息"""
+        if self._dispatch_version != self.registry.version:
+            self._dispatch_cache.clear()
+            self._arg_plan_cache.clear()
+            self._stats_cache = None
+            self._caps_list_cache = None
+            self._dispatch_version = self.registry.version
+    
+    def _reset_module_state(self) -> None:
+        """复用时丢弃按 capability 名称缓存的调用信息"""
+        self._dispatch_cache.clear()
+        self._arg_plan_cache.clear()
+        self._stats_cache = None
+        self._caps_list_cache = None
+        self._dispatch_version = self.registry.version
+    
+    def _resolve_capability(
+        self,
+        capability_name: str
+    ) -> Optional[_DispatchEntry]:
+        """
+        查询 capability 及其调用信息（带缓存）
+        
+        反射检查（FunctionTool 识别、协程函数判断）只在首次查询时进行，
+        registry 注册或清空后缓存整体失效。
+        
+        Args:
+            capability_name: Capability 名称
+        
+        Returns:
+            调用信息，不存在时返回 None
+        """
+        self._sync_registry_caches()
+        entry = self._dispatch_cache.get(capability_name)
+        if entry is not None:
+            return entry
+        
+        capability = self.registry.get(capability_name)
+        if capability is None:
+            return None
+        
+        func = None
+        is_coroutine = False
+        is_function_tool = False
+        required_params: FrozenSet[str] = frozenset()
+        if capability.capability_type == "function":
+            func = self.registry.get_function(capability.name)
+            if FunctionTool is not None:
+                is_function_tool = isinstance(func, FunctionTool)
+            else:
+                # 无 SDK 时按特征识别：有 on_invoke_tool 方法但自身不是 callable
+                is_function_tool = (
+                    hasattr(func, 'on_invoke_tool') and
+                    hasattr(func, 'name') and
+                    hasattr(func, 'description')
+                )
+            target = func.on_invoke_tool if is_function_tool else func
+            # 新版 SDK 的 on_invoke_tool 是带 async __call__ 的可调用对象
+            is_coroutine = (
+                asyncio.iscoroutinefunction(target)
+                or (callable(target)
+                    and asyncio.iscoroutinefunction(type(target).__call__))
             )
+            # 只预校验 function 类型；agent/mcp 的参数在调用时另行映射
+            if callable(target):
+                required_params = _required_params(func, is_function_tool)
+        
+        entry = _DispatchEntry(capability, func, is_coroutine, is_function_tool, required_params)
+        self._dispatch_cache[capability_name] = entry
+        return entry
+    
+    @staticmethod
+    def _is_recoverable(entry: _DispatchEntry, error: Exception) -> bool:
+        """
+        判断异常是否为可重试的暂时性失败
+        
+        连接错误和模块显式抛出的 RetryableError 可重试；MCP 客户端把传输层
+        错误包装成 RuntimeError，因此 mcp 类型额外重试 RuntimeError。
+        超时只在调用确实已被取消时重试（见 _timeout_cancels_call），否则
+        重试会让仍在运行的调用再执行一遍。参数错误（ValueError、TypeError
+        等）重试也不会成功，直接返回。
+        
+        Args:
+            entry: 当前调用的 capability 调用信息
+            error: 捕获的异常
+        
+        Returns:
+            是否应重试
+        """
+        if isinstance(error, asyncio.TimeoutError):
+            return ExecutionModule._timeout_cancels_call(entry)
+        if isinstance(error, _RECOVERABLE_ERRORS):
+            return True
+        return entry.capability.capability_type == "mcp" and isinstance(error, RuntimeError)
+    
+    @staticmethod
+    def _timeout_cancels_call(entry: _DispatchEntry) -> bool:
+        """
+        超时后调用是否已被真正取消
+        
+        只有直接 await 的协程会随 wait_for 超时被取消。交给线程池的同步调用
+        无法中止，超时后仍在后台运行；agent（subagent）调用耗时长且可能有
+        副作用，超时也不重试。
+        """
+        capability = entry.capability
+        if capability.capability_type == "function":
+            return entry.is_coroutine
+        if capability.capability_type == "mcp":
+            server = capability.mcp_server_object
+            return asyncio.iscoroutinefunction(getattr(server, "call_tool", None))
+        return False
+    
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """
+        计算第 attempt 次重试前的等待时间（指数退避 + 抖动）
+        
+        Args:
+            attempt: 已重试次数（从0开始）
+        
+        Returns:
+            等待秒数
+        """
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt))
+        return delay * (1 + random.random() * RETRY_JITTER)
     
     async def execute_batch(
         self,
@@ -386,55 +718,64 @@ class ExecutionModule(BaseModule):
         """
         批量并发执行多个 capability 调用
         
+        同时进行的调用数受 max_concurrency 限制；结果按完成顺序处理，
+        快速调用无需等待慢调用即可记录，最终列表仍与请求顺序一致。
+        
         Args:
             requests: 调用请求列表，每个包含 capability_name 和 arguments
             
         Returns:
-            调用结果列表
-        """
-        _logger.info(f"Executing batch of {len(requests)} capabilities")
-        
-        # 创建异步任务
-        tasks = []
-        for req in requests:
-            if isinstance(req, dict):
-                task = self.execute(
-                    capability_name=req.get("capability_name", req.get("name")),
-                    arguments=req.get("arguments", {}),
-                    call_id=req.get("call_id")
-                )
-            else:
-                # 如果是 CapabilityCallRequest 对象
-                task = self.execute(
-                    capability_name=req["capability_name"],
-                    arguments=req["arguments"],
-                    call_id=req.get("call_id")
-                )
-            tasks.append(task)
-        
-        # 并发执行
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 处理异常
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                req = requests[i]
-                call_id = req.get("call_id", f"call_{i}")
-                capability_name = req.get("capability_name", req.get("name", "unknown"))
+            调用结果列表（与 requests 顺序一致）
+        """
+        total = len(requests)
+        _logger.info(f"Executing batch of {total} capabilities")
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def _run(index: int, req: Dict[str, Any]):
+            async with semaphore:
+                try:
+                    return index, await self.execute(
+                        capability_name=req.get("capability_name", req.get("name")),
+                        arguments=req.get("arguments", {}),
+                        call_id=req.get("call_id")
+                    )
+                except Exception as e:
+                    return index, e
+        
+        processed_results: List[Optional[CapabilityCallResult]] = [None] * total
+        completed = 0
+        success_count = 0
+        
+        # TaskGroup 持有全部调用：调用方被取消时，未完成的调用一并取消，
+        # 不会遗留仍在运行的 MCP/agent 请求。单个调用的异常已在 _run 中
+        # 转为结果，不会中止整个批次。
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(_run(i, req)) for i, req in enumerate(requests)]
+            
+            # 按完成顺序收集，写回请求对应的位置
+            for future in asyncio.as_completed(tasks):
+                index, result = await future
+                completed += 1
                 
-                processed_results.append(CapabilityCallResult(
-                    call_id=call_id,
-                    capability_name=capability_name,
-                    success=False,
-                    error=str(result)
-                ))
-            else:
-                processed_results.append(result)
+                if isinstance(result, Exception):
+                    req = requests[index]
+                    result = CapabilityCallResult(
+                        call_id=req.get("call_id", f"call_{index}"),
+                        capability_name=req.get("capability_name", req.get("name", "unknown")),
+                        success=False,
+                        error=str(result)
+                    )
+                
+                processed_results[index] = result
+                success_count += bool(result["success"])
+                _logger.debug(
+                    "Batch progress %d/%d: %s success=%s",
+                    completed, total, result["capability_name"], result["success"]
+                )
         
-        success_count = sum(1 for r in processed_results if r["success"])
         _logger.info(
-            f"Batch execution completed: {success_count}/{len(requests)} successful"
+            f"Batch execution completed: {success_count}/{total} successful"
         )
         
         return processed_results
@@ -456,32 +797,25 @@ class ExecutionModule(BaseModule):
         Returns:
             函数执行结果
         """
-        func = self.registry.get_function(capability.name)
+        entry = self._resolve_capability(capability.name)
+        func, is_coroutine, is_function_tool = entry[1:4] if entry else (None, False, False)
         
         if func is None:
             raise RuntimeError(f"Function not found for capability: {capability.name}")
         
         _logger.debug(f"Calling function: {capability.name}(**{arguments})")
         
-        # 检查是否是 FunctionTool 对象（来自 OpenAI Agent SDK）
-        # FunctionTool 有 on_invoke_tool 方法但自身不是 callable
-        is_function_tool = (
-            hasattr(func, 'on_invoke_tool') and
-            hasattr(func, 'name') and
-            hasattr(func, 'description')
-        )
-        
+        # 是否是 FunctionTool 对象（来自 OpenAI Agent SDK），见 _resolve_capability
         if is_function_tool:
             # 这是一个 FunctionTool 对象
             # on_invoke_tool 需要 (ctx: ToolContext, input: str)
             # 我们需要将参数转换为 JSON 字符串
-            import json
-            from agents.tool_context import ToolContext
-            
             # 将参数转换为 JSON 字符串
-            input_json = json.dumps(arguments)
+            input_json = _json_dumps(arguments)
             
             # 创建一个简单的 context（需要 tool_name, tool_call_id, tool_arguments）
+            # 每次调用直接构造：ToolContext 是 dataclass，copy.copy 模板反而比构造慢，
+            # 且 context/usage 是可变对象，共享模板会在调用之间泄漏状态
             ctx = ToolContext(
                 context={},
                 tool_name=capability.name,
@@ -492,20 +826,29 @@ class ExecutionModule(BaseModule):
             _logger.debug(f"Calling FunctionTool with JSON: {input_json}")
             
             # 调用 on_invoke_tool
-            if asyncio.iscoroutinefunction(func.on_invoke_tool):
+            if is_coroutine:
                 result = await func.on_invoke_tool(ctx, input_json)
             else:
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(None, lambda: func.on_invoke_tool(ctx, input_json))
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._cpu_executor,
+                    functools.partial(func.on_invoke_tool, ctx, input_json)
+                )
+            
+            # SDK 通过返回错误消息而非抛出异常来报告工具失败
+            if isinstance(result, str) and result.startswith(_SDK_TOOL_ERROR_PREFIXES):
+                raise CapabilityExecutionError(result, result)
         elif callable(func):
             # 这是一个普通函数
-            if asyncio.iscoroutinefunction(func):
+            if is_coroutine:
                 # 异步函数，直接 await
                 result = await func(**arguments)
             else:
                 # 同步函数，在 executor 中运行
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(None, lambda: func(**arguments))
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._cpu_executor, functools.partial(func, **arguments)
+                )
         else:
             # 增强错误信息，帮助调试
             func_type = type(func).__name__
@@ -516,6 +859,7 @@ class ExecutionModule(BaseModule):
                 f"Is callable: {callable(func)}, Attributes: {func_attrs}"
             )
         
+        _raise_on_error_result(result)
         return result
     
     async def _execute_agent(
@@ -555,11 +899,8 @@ class ExecutionModule(BaseModule):
         
         _logger.info(f"Handoff to subagent '{capability.name}' with input: {user_input[:100]}...")
         
-        try:
+        if _HAS_AGENTS_SDK:
             # 使用 OpenAI Agent SDK 的 Runner
-            from agents import Runner
-            
-            # 运行 agent
             result = await Runner.run(
                 starting_agent=agent,
                 input=user_input,
@@ -567,21 +908,25 @@ class ExecutionModule(BaseModule):
             )
             
             # 返回最终输出
-            return result.final_output if hasattr(result, 'final_output') else str(result)
-            
-        except ImportError:
-            # 如果没有 Agent SDK，尝试直接调用 run 方法
-            _logger.warning("OpenAI Agent SDK not available, trying direct run() call")
-            
-            if hasattr(agent, 'run'):
-                if asyncio.iscoroutinefunction(agent.run):
-                    result = await agent.run(user_input)
-                else:
-                    loop = asyncio.get_event_loop()
-                    result = await loop.run_in_executor(None, lambda: agent.run(user_input))
-                return result
+            output = result.final_output if hasattr(result, 'final_output') else str(result)
+            _raise_on_error_result(output)
+            return output
+        
+        # 如果没有 Agent SDK，尝试直接调用 run 方法
+        _logger.warning("OpenAI Agent SDK not available, trying direct run() call")
+        
+        if hasattr(agent, 'run'):
+            if asyncio.iscoroutinefunction(agent.run):
+                result = await agent.run(user_input)
             else:
-                raise RuntimeError(f"Agent {capability.name} has no run() method")
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._io_executor, functools.partial(agent.run, user_input)
+                )
+            _raise_on_error_result(result)
+            return result
+        else:
+            raise RuntimeError(f"Agent {capability.name} has no run() method")
     
     async def _execute_mcp(
         self,
@@ -615,11 +960,12 @@ class ExecutionModule(BaseModule):
             if asyncio.iscoroutinefunction(mcp_server.call_tool):
                 result = await mcp_server.call_tool(tool_name, tool_args)
             else:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 result = await loop.run_in_executor(
-                    None,
-                    lambda: mcp_server.call_tool(tool_name, tool_args)
+                    self._io_executor,
+                    functools.partial(mcp_server.call_tool, tool_name, tool_args)
                 )
+            _raise_on_error_result(result)
             return result
         else:
             raise RuntimeError(f"MCP server {capability.name} has no call_tool() method")
@@ -644,10 +990,15 @@ class ExecutionModule(BaseModule):
         """
         列出所有可用的 capability
         
+        结果按 registry 版本缓存，调用方不应修改返回的列表。
+        
         Returns:
             Capability 名称列表
         """
-        return self.registry.list_all()
+        self._sync_registry_caches()
+        if self._caps_list_cache is None:
+            self._caps_list_cache = self.registry.list_all()
+        return self._caps_list_cache
     
     def _build_arguments_from_task(
         self,
@@ -669,12 +1020,56 @@ class ExecutionModule(BaseModule):
         Returns:
             构造的参数字典
         """
-        # 获取capability的参数schema
-        capability = self.registry.get(capability_name)
-        if not capability:
+        plan = self._get_argument_plan(capability_name)
+        if plan is None:
             _logger.warning(f"Capability {capability_name} not found, using task_description as default")
             return {"input": task_description}
         
+        arguments = {}
+        
+        # 主参数：优先级列表中第一个存在的参数名
+        if plan.primary is not None:
+            arguments[plan.primary] = task_description
+        
+        # 如果有 'data' 参数且task_detail_info中有数据
+        if plan.has_data and task_detail_info and 'data' in task_detail_info:
+            arguments['data'] = task_detail_info['data']
+        
+        # 如果task_detail_info中有明确的参数映射，使用它们
+        if isinstance(task_detail_info, dict):
+            for param_name in plan.param_names:
+                if param_name in task_detail_info:
+                    arguments[param_name] = task_detail_info[param_name]
+        
+        # 如果还没有设置任何参数，使用回退参数名
+        if plan.primary is None and not arguments:
+            arguments[plan.fallback] = task_description
+        
+        _logger.debug(f"Built arguments for {capability_name}: {arguments}")
+        return arguments
+
+    def _get_argument_plan(self, capability_name: str) -> Optional['_ArgumentPlan']:
+        """
+        获取capability的参数映射方案（带缓存）
+        
+        参数schema对同一capability不变，只在首次调用时分析，
+        registry 变化后重新计算。
+        
+        Args:
+            capability_name: Capability名称
+        
+        Returns:
+            参数映射方案，capability不存在时返回 None
+        """
+        self._sync_registry_caches()
+        plan = self._arg_plan_cache.get(capability_name)
+        if plan is not None:
+            return plan
+        
+        capability = self.registry.get(capability_name)
+        if not capability:
+            return None
+        
         # 获取参数定义
         params_schema = capability.parameters or {}
         
@@ -687,81 +1082,55 @@ class ExecutionModule(BaseModule):
             else:
                 params_schema = {}
         
-        arguments = {}
+        # 找到第一个存在的常见参数名
+        primary = next((name for name in _PARAM_PRIORITY if name in params_schema), None)
         
-        # 常见的参数名映射策略
-        # 优先检查最常见的参数名
-        param_priority = [
-            'requirement',  # 最高优先级
-            'query',
-            'input',
-            'text',
-            'content',
-            'prompt',
-            'message'
+        # 回退参数：第一个必需参数 → 第一个参数 → 通用的input字段
+        required_params = [
+            param_name for param_name, param_schema in params_schema.items()
+            if isinstance(param_schema, dict) and param_schema.get('required', False)
         ]
+        if required_params:
+            fallback = required_params[0]
+        elif params_schema:
+            fallback = next(iter(params_schema))
+        else:
+            fallback = 'input'
         
-        # 找到第一个存在的参数名并使用
-        primary_param_set = False
-        for param_name in param_priority:
-            if param_name in params_schema:
-                arguments[param_name] = task_description
-                primary_param_set = True
-                break
-        
-        # 4. 如果有 'data' 参数且task_detail_info中有数据
-        if 'data' in params_schema and task_detail_info:
-            # 尝试从task_detail_info中提取数据
-            if 'data' in task_detail_info:
-                arguments['data'] = task_detail_info['data']
-        
-        # 5. 如果task_detail_info中有明确的参数映射，使用它们
-        if isinstance(task_detail_info, dict) and isinstance(params_schema, dict):
-            # 检查是否有直接的参数值
-            for param_name in params_schema.keys():
-                if param_name in task_detail_info:
-                    arguments[param_name] = task_detail_info[param_name]
-        
-        # 6. 如果还没有设置主参数，尝试其他策略
-        if not primary_param_set and not arguments:
-            # 尝试使用第一个必需参数
-            required_params = []
-            for param_name, param_schema in params_schema.items():
-                # 处理schema可能是dict或其他类型
-                if isinstance(param_schema, dict):
-                    if param_schema.get('required', False):
-                        required_params.append(param_name)
-            
-            if required_params:
-                # 使用第一个必需参数
-                arguments[required_params[0]] = task_description
-            elif params_schema:
-                # 如果没有必需参数，使用第一个参数
-                first_param = next(iter(params_schema.keys()))
-                arguments[first_param] = task_description
-            else:
-                # 完全没有schema，使用通用的input字段
-                arguments['input'] = task_description
-        
-        _logger.debug(f"Built arguments for {capability_name}: {arguments}")
-        return arguments
+        plan = _ArgumentPlan(
+            primary=primary,
+            has_data='data' in params_schema,
+            param_names=tuple(params_schema),
+            fallback=fallback
+        )
+        self._arg_plan_cache[capability_name] = plan
+        return plan
     
     def get_statistics(self) -> Dict[str, Any]:
         """
         获取执行统计信息
         
+        结果按 registry 版本缓存，调用方不应修改返回的字典。
+        
         Returns:
             统计信息字典
         """
+        self._sync_registry_caches()
+        if self._stats_cache is not None:
+            return self._stats_cache
+        
         capabilities = self.registry.get_all()
         
-        return {
+        # 单次遍历按类型计数
+        by_type = {"function": 0, "agent": 0, "mcp": 0}
+        for c in capabilities.values():
+            if c.capability_type in by_type:
+                by_type[c.capability_type] += 1
+        
+        self._stats_cache = {
             "total_capabilities": len(capabilities),
-            "by_type": {
-                "function": sum(1 for c in capabilities.values() if c.capability_type == "function"),
-                "agent": sum(1 for c in capabilities.values() if c.capability_type == "agent"),
-                "mcp": sum(1 for c in capabilities.values() if c.capability_type == "mcp"),
-            },
+            "by_type": by_type,
             "capabilities": list(capabilities.keys())
         }
+        return self._stats_cache
 
@@ -9,20 +9,36 @@ Observe Module - 观察与决策模块
 这是实现OODA循环的核心组件。
 """
 
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+import asyncio
+from collections import Counter, deque
+from itertools import islice
+from typing import Deque, List, Dict, Any, Optional, Sequence, Tuple, TYPE_CHECKING
 from enum import Enum
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 if TYPE_CHECKING:
-    from agents import Agent, Runner
     from pisa.core.loop.state import LoopState
     from pisa.core.loop.context import LoopContext
 
-from pisa.core.loop.modules.base import BaseModule, ModuleConfig, ObserveModuleConfig
+from pisa.core.loop.modules.base import (
+    BaseModule,
+    ModuleConfig,
+    ObserveModuleConfig,
+    METADATA_PATCH_KEY,
+)
 from pisa.core.planning.task_tree import TaskTree, TaskNode, TaskStatus
 from pisa.utils.logger import get_logger
 
+# OpenAI Agent SDK 为可选依赖，在模块加载时导入一次
+try:
+    from agents import Agent, Runner
+    _HAS_AGENTS_SDK = True
+except ImportError:
+    Agent = None
+    Runner = None
+    _HAS_AGENTS_SDK = False
+
 _logger = get_logger(__name__)
 
 
@@ -60,6 +76,102 @@ class ActionType(str, Enum):
     TERMINATE = "terminate"              # 终止执行
 
 
+# 错误分类规则：按顺序匹配，先命中的类型优先
+_ERROR_KEYWORDS = {
+    FailureType.TIMEOUT: ("timeout", "timed out", "time out"),
+    FailureType.CAPABILITY_MISSING: ("not found", "missing", "unavailable"),
+    FailureType.TRANSIENT: ("network", "connection", "unreachable"),
+    FailureType.VALIDATION_FAILED: ("validation", "invalid", "malformed"),
+    FailureType.DEPENDENCY_FAILED: ("dependency", "prerequisite"),
+    FailureType.PARAMETER_ERROR: ("parameter", "argument", "input"),
+    FailureType.SYSTEMATIC: ("config", "setup", "initialization"),
+}
+
+def _observation_from_dict(model_cls: type, data: Dict[str, Any]) -> Any:
+    """
+    将 dict 形式的观察结果恢复为模型对象
+    
+    本模块对象经 model_dump()（python 模式）得到的 dict 中，error_type 与
+    observed_at 仍是 FailureType / datetime，可直接 model_construct 跳过校验；
+    经过 JSON 往返（如 LoopState.to_json / from_json）的 dict 中它们是字符串，
+    需要 model_validate 重新转换类型。
+    """
+    observed_at = data.get("observed_at")
+    error_type = data.get("error_type")
+    if (
+        (observed_at is None or isinstance(observed_at, datetime))
+        and (error_type is None or isinstance(error_type, FailureType))
+    ):
+        return model_cls.model_construct(**data)
+    return model_cls.model_validate(data)
+
+
+# handle() 的决策分发表：action → (控制信号, 统计键, 日志级别, 日志消息)
+_ACTION_HANDLING = {
+    ActionType.TERMINATE: (
+        {"should_stop": True}, None,
+        "INFO", "Decision: TERMINATE - stopping execution"
+    ),
+    ActionType.REPLAN_ALL: (
+        {"should_replan": True}, "replans_triggered",
+        "INFO", "Decision: REPLAN_ALL - triggering replan"
+    ),
+    ActionType.RETRY: (
+        {"should_retry": True}, "retries_triggered",
+        "INFO", "Decision: RETRY - retrying task"
+    ),
+    ActionType.ESCALATE: (
+        {"should_stop": True}, "escalations_triggered",
+        "WARNING", "Decision: ESCALATE - human intervention needed"
+    ),
+    ActionType.CONTINUE: (
+        # 继续执行，不设置特殊信号
+        {}, None,
+        "INFO", "Decision: CONTINUE - proceeding normally"
+    ),
+}
+
+# 根因分析 Agent 的指令与输入模板（模块加载时构建一次）
+_ROOT_CAUSE_INSTRUCTIONS = (
+    "You are an expert at analyzing task execution failures. Be concise and precise."
+)
+
+_ROOT_CAUSE_PROMPT = """\
+Analyze the following task execution failure and provide root cause analysis.
+
+Task Information:
+- Description: {task_description}
+- Task ID: {task_id}
+- Error Type: {error_type}
+- Error Message: {error}
+
+Please provide:
+1. Root cause (what is the fundamental reason for failure?)
+2. Whether this is systematic or transient
+3. Confidence level (0.0-1.0)
+
+Respond in JSON format:
+{{
+    "root_cause": "brief explanation",
+    "is_systematic": true/false,
+    "confidence": 0.0-1.0
+}}
+"""
+
+# 预计算重试延迟表的最大长度（max_retries_per_task 更大时超出部分现算）
+_RETRY_DELAY_TABLE_SIZE = 32
+
+# 观察/决策历史默认保留条数
+DEFAULT_HISTORY_WINDOW = 256
+
+# 可恢复的错误类型
+_RECOVERABLE_TYPES = frozenset({
+    FailureType.TRANSIENT,
+    FailureType.TIMEOUT,
+    FailureType.PARAMETER_ERROR,
+})
+
+
 # ===== Data Models ===== #
 
 class TaskObservation(BaseModel):
@@ -171,10 +283,17 @@ class ObservationContext(BaseModel):
     current_iteration: int = Field(default=0, description="当前迭代次数")
     max_iterations: int = Field(default=10, description="最大迭代次数")
     
-    # 观察历史
-    task_observations: List[TaskObservation] = Field(default_factory=list, description="任务观察历史")
-    plan_observations: List[PlanObservation] = Field(default_factory=list, description="计划观察历史")
-    past_decisions: List[DecisionResult] = Field(default_factory=list, description="决策历史")
+    # 观察历史（只保留最近 history_window 条）
+    history_window: int = Field(
+        default=DEFAULT_HISTORY_WINDOW, ge=1, description="历史记录保留条数"
+    )
+    task_observations: Deque[TaskObservation] = Field(
+        default_factory=deque, description="任务观察历史"
+    )
+    plan_observations: Deque[PlanObservation] = Field(
+        default_factory=deque, description="计划观察历史"
+    )
+    past_decisions: Deque[DecisionResult] = Field(default_factory=deque, description="决策历史")
     
     # 约束条件
     max_retries_per_task: int = Field(default=3, description="每个任务最大重试次数")
@@ -187,6 +306,13 @@ class ObservationContext(BaseModel):
     
     class Config:
         arbitrary_types_allowed = True
+    
+    def model_post_init(self, _context: Any, /) -> None:
+        """将历史记录转为定长队列，超出窗口的旧记录自动淘汰"""
+        window = self.history_window
+        self.task_observations = deque(self.task_observations, maxlen=window)
+        self.plan_observations = deque(self.plan_observations, maxlen=window)
+        self.past_decisions = deque(self.past_decisions, maxlen=window)
 
 
 # ===== Observe Module ===== #
@@ -215,7 +341,7 @@ class ObserveModule(BaseModule):
     # ==================== 依赖声明 ====================
     
     STATE_REQUIRES = ['task', 'result']  # 默认观察任务执行
-    STATE_PRODUCES = ['observation', 'metadata']
+    STATE_PRODUCES = ['observation', 'metadata']  # metadata 通过 metadata_patch 增量更新
     
     # ==================== 初始化 ====================
     
@@ -254,12 +380,39 @@ class ObserveModule(BaseModule):
         # 使用observe_model或回退到默认model
         self.observe_model = config.observe_model or self.model
         
+        # 根因分析 Agent，首次分析时构建（见 _get_root_cause_agent）
+        self._root_cause_agent: Optional['Agent'] = None
+        
         # 初始化观察上下文
         self.observation_context = ObservationContext(
             current_iteration=0,
-            max_iterations=kwargs.get('max_iterations', 10)
+            max_iterations=kwargs.get('max_iterations', 10),
+            history_window=config.history_window
         )
         
+        # 决策分布计数（随 past_decisions 增量维护，见 _record_decision）
+        self._decision_counts: Counter = Counter()
+        
+        # 决策矩阵读取的配置快照
+        self.invalidate_config_cache()
+        
+        # 反向依赖索引缓存（见 _get_dependent_counts）
+        self._dependents_tree: Optional[TaskTree] = None
+        self._dependents_key: Optional[tuple] = None
+        self._dependents_index: Dict[str, int] = {}
+        
+        # 按错误类型分发的决策规则（见 _evaluate_decision_matrix）
+        self._early_rules = {
+            FailureType.TRANSIENT: self._rule_retry,
+            FailureType.TIMEOUT: self._rule_retry,
+            FailureType.CAPABILITY_MISSING: self._rule_replan_task,
+        }
+        self._late_rules = {
+            FailureType.DEPENDENCY_FAILED: self._rule_skip,
+            FailureType.SYSTEMATIC: self._rule_escalate,
+            FailureType.PARAMETER_ERROR: self._rule_adjust_params,
+        }
+        
         _logger.info(
             f"ObserveModule initialized | model={self.observe_model} | "
             f"llm_analysis={config.enable_llm_analysis} | "
@@ -267,6 +420,30 @@ class ObserveModule(BaseModule):
             f"has_context={self.context is not None}"
         )
     
+    def invalidate_config_cache(self) -> None:
+        """
+        刷新决策矩阵使用的配置快照
+        
+        决策时不再逐次读取 config / observation_context 的字段；
+        运行期间修改了相关配置或约束后需调用此方法。
+        """
+        config = self.config
+        self._enable_llm_analysis = config.enable_llm_analysis
+        self._conservative_mode = config.conservative_mode
+        self._exp_backoff = config.exponential_backoff
+        self._base_retry_delay = config.base_retry_delay
+        self._max_retry_delay = config.max_retry_delay
+        self._replan_threshold = config.replan_threshold
+        self._failure_rate_threshold = config.failure_rate_threshold
+        self._max_retries_per_task = self.observation_context.max_retries_per_task
+        self._max_replans = self.observation_context.max_replans
+        
+        # 指数退避的重试延迟按 retry_count 预先计算
+        self._retry_delays = tuple(
+            self._compute_retry_delay(retry_count)
+            for retry_count in range(min(self._max_retries_per_task, _RETRY_DELAY_TABLE_SIZE))
+        )
+    
     def _init_stats(self) -> Dict[str, Any]:
         """初始化统计信息（BaseModule抽象方法实现）"""
         return {
@@ -289,8 +466,6 @@ class ObserveModule(BaseModule):
         Returns:
             包含observation和metadata的字典
         """
-        from pisa.core.planning.task_tree import TaskNode
-        
         task = state.task
         result = state.result
         
@@ -314,25 +489,29 @@ class ObserveModule(BaseModule):
                 "execution_time": getattr(result, 'execution_time', 0.0)
             }
         
+        # 本次观察只读取一次时钟，观察对象与 metadata 共用同一时间戳
+        observed_at = datetime.now()
+        
         # 调用现有的业务逻辑
         observation = await self.observe_task_execution(
             task=task_node,
             execution_result=execution_result,
-            context=state.metadata
+            context=state.metadata,
+            observed_at=observed_at
         )
         
         # 更新到Context（可选）
         if self.context:
             self.context.add_observation_message(observation)
         
+        # metadata 只返回增量，由 _update_state 合并
         return {
             "observation": observation,
-            "metadata": {
-                **state.metadata,
+            METADATA_PATCH_KEY: {
                 "last_observation": {
                     "task_id": observation.task_id,
                     "success": observation.success,
-                    "observed_at": observation.observed_at.isoformat()
+                    "observed_at": observed_at.isoformat()
                 }
             }
         }
@@ -354,12 +533,12 @@ class ObserveModule(BaseModule):
         # 如果observation是字典，转换为TaskObservation对象
         # (因为LoopState.with_update使用model_dump()会将Pydantic对象序列化)
         if isinstance(observation, dict):
-            observation = TaskObservation(**observation)
+            observation = _observation_from_dict(TaskObservation, observation)
         
         # 获取plan observation（如果有）
         plan_observation = state.get('plan_observation')
         if isinstance(plan_observation, dict):
-            plan_observation = PlanObservation(**plan_observation)
+            plan_observation = _observation_from_dict(PlanObservation, plan_observation)
         
         # 调用现有的决策逻辑
         decision = await self.decide_next_action(
@@ -368,7 +547,7 @@ class ObserveModule(BaseModule):
         )
         
         # 更新统计
-        self.stats["decisions_count"] = self.stats.get("decisions_count", 0) + 1
+        self.stats["decisions_count"] += 1
         
         # 更新到Context（可选）
         if self.context:
@@ -390,42 +569,28 @@ class ObserveModule(BaseModule):
         if decision is None:
             raise ValueError("ObserveModule.handle requires state.decision")
         
-        # 根据决策类型设置控制信号
-        updates = {}
-        
-        if decision.action == ActionType.TERMINATE:
-            updates['should_stop'] = True
-            _logger.info("Decision: TERMINATE - stopping execution")
-        
-        elif decision.action == ActionType.REPLAN_ALL:
-            updates['should_replan'] = True
-            _logger.info("Decision: REPLAN_ALL - triggering replan")
-            self.stats["replans_triggered"] = self.stats.get("replans_triggered", 0) + 1
+        # 根据决策类型设置控制信号（查表分发，见 _ACTION_HANDLING）
+        action = decision.action
+        entry = _ACTION_HANDLING.get(action)
+        if entry is None:
+            # 其他action类型
+            _logger.info(f"Decision: {action} - custom handling")
+            return state
         
-        elif decision.action == ActionType.RETRY:
-            updates['should_retry'] = True
-            _logger.info("Decision: RETRY - retrying task")
-            self.stats["retries_triggered"] = self.stats.get("retries_triggered", 0) + 1
+        signals, stats_key, log_level, message = entry
+        updates = dict(signals)
         
-        elif decision.action == ActionType.ESCALATE:
-            updates['should_stop'] = True
-            updates['metadata'] = {
-                **state.metadata,
+        if action == ActionType.ESCALATE:
+            updates['metadata'] = state.metadata | {
                 'escalation': {
                     'reason': decision.reason,
                     'confidence': decision.confidence
                 }
             }
-            _logger.warning("Decision: ESCALATE - human intervention needed")
-            self.stats["escalations_triggered"] = self.stats.get("escalations_triggered", 0) + 1
         
-        elif decision.action == ActionType.CONTINUE:
-            # 继续执行，不设置特殊信号
-            _logger.info("Decision: CONTINUE - proceeding normally")
-        
-        else:
-            # 其他action类型
-            _logger.info(f"Decision: {decision.action} - custom handling")
+        _logger.system(message, log_level)
+        if stats_key is not None:
+            self.stats[stats_key] += 1
         
         return state.with_update(**updates) if updates else state
     
@@ -436,7 +601,8 @@ class ObserveModule(BaseModule):
         self,
         task: TaskNode,
         execution_result: Dict[str, Any],
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        observed_at: Optional[datetime] = None
     ) -> TaskObservation:
         """
         观察单个任务的执行结果
@@ -445,17 +611,82 @@ class ObserveModule(BaseModule):
             task: 任务节点
             execution_result: 执行结果字典
             context: 额外上下文信息
+            observed_at: 观察时间（调用方已取得时间戳时传入，省去再次读取时钟）
         
         Returns:
             TaskObservation: 任务观察结果
         """
-        self.log_operation(
-            "observe_task_execution",
-            status="running",
-            task_id=task.task_id
+        # 1-2. 提取基础信息并分类错误
+        observation = self._build_task_observation(task, execution_result, observed_at)
+        
+        # 2.3 根因分析（使用LLM）
+        if self._needs_root_cause(observation):
+            await self._apply_root_cause(observation, task, context)
+        
+        # 3-4. 检查依赖和能力，记录到观察上下文
+        self._finalize_task_observation(observation, task, context)
+        
+        return observation
+    
+    async def observe_batch(
+        self,
+        pairs: List[Tuple[TaskNode, Dict[str, Any]]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[TaskObservation]:
+        """
+        批量观察多个任务的执行结果
+        
+        适用于并行任务执行后一次性观察多个结果：失败任务的根因分析
+        并发进行（同时进行的 LLM 调用数受 max_concurrent_llm 限制），
+        其余步骤与 observe_task_execution 相同，观察按输入顺序记录。
+        
+        Args:
+            pairs: (任务节点, 执行结果字典) 列表
+            context: 额外上下文信息
+        
+        Returns:
+            观察结果列表（与 pairs 顺序一致）
+        """
+        observed_at = datetime.now()
+        observations = [
+            self._build_task_observation(task, execution_result, observed_at)
+            for task, execution_result in pairs
+        ]
+        
+        # 失败任务的根因分析并发执行，单个分析失败已在 _apply_root_cause 中处理
+        pending = [
+            (observation, task)
+            for observation, (task, _) in zip(observations, pairs, strict=True)
+            if self._needs_root_cause(observation)
+        ]
+        if pending:
+            semaphore = asyncio.Semaphore(self.config.max_concurrent_llm)
+            
+            async def _analyze(observation: TaskObservation, task: TaskNode) -> None:
+                async with semaphore:
+                    await self._apply_root_cause(observation, task, context)
+            
+            async with asyncio.TaskGroup() as tg:
+                for observation, task in pending:
+                    tg.create_task(_analyze(observation, task))
+        
+        for observation, (task, _) in zip(observations, pairs, strict=True):
+            self._finalize_task_observation(observation, task, context)
+        
+        _logger.info(
+            f"Batch observation completed: {len(observations)} tasks, "
+            f"{len(pending)} analyzed"
         )
         
-        # 1. 提取基础信息
+        return observations
+    
+    def _build_task_observation(
+        self,
+        task: TaskNode,
+        execution_result: Dict[str, Any],
+        observed_at: Optional[datetime]
+    ) -> TaskObservation:
+        """构建任务观察：提取基础信息，失败时分类错误并判断可恢复性"""
         # 确保result是dict类型
         result_value = execution_result.get("result")
         if result_value is not None and not isinstance(result_value, dict):
@@ -469,53 +700,73 @@ class ObserveModule(BaseModule):
             execution_time=execution_result.get("execution_time", 0.0),
             retry_count=execution_result.get("retries", 0),
             result=result_value,
-            error=execution_result.get("error")
+            error=execution_result.get("error"),
+            observed_at=observed_at if observed_at is not None else datetime.now()
         )
         
-        # 2. 如果失败，进行深度分析
         if not observation.success and observation.error:
-            # 2.1 分类错误类型
-            observation.error_type = await self._classify_error(observation.error)
+            # 分类错误类型
+            observation.error_type = self._classify_error(observation.error)
             
-            # 2.2 判断可恢复性
+            # 判断可恢复性
             observation.is_recoverable = self._is_recoverable(observation.error_type)
-            
-            # 2.3 根因分析（使用LLM）
-            if self.config.enable_llm_analysis:
-                try:
-                    root_cause_analysis = await self._analyze_root_cause(
-                        task=task,
-                        error=observation.error,
-                        error_type=observation.error_type,
-                        context=context
-                    )
-                    observation.root_cause = root_cause_analysis.get("root_cause")
-                    observation.confidence = root_cause_analysis.get("confidence", 0.7)
-                except Exception as e:
-                    _logger.warning(f"Root cause analysis failed: {e}")
-                    observation.root_cause = f"Analysis failed: {str(e)}"
-                    observation.confidence = 0.3
         else:
             # 成功任务
             observation.confidence = 1.0
         
-        # 3. 检查依赖和能力
+        return observation
+    
+    def _needs_root_cause(self, observation: TaskObservation) -> bool:
+        """是否需要对该观察进行 LLM 根因分析"""
+        return (
+            self._enable_llm_analysis
+            and not observation.success
+            and bool(observation.error)
+        )
+    
+    async def _apply_root_cause(
+        self,
+        observation: TaskObservation,
+        task: TaskNode,
+        context: Optional[Dict[str, Any]]
+    ) -> None:
+        """运行根因分析并写回观察结果"""
+        try:
+            root_cause_analysis = await self._analyze_root_cause(
+                task=task,
+                error=observation.error,
+                error_type=observation.error_type,
+                context=context
+            )
+            observation.root_cause = root_cause_analysis.get("root_cause")
+            observation.confidence = root_cause_analysis.get("confidence", 0.7)
+        except Exception as e:
+            _logger.warning(f"Root cause analysis failed: {e}")
+            observation.root_cause = f"Analysis failed: {str(e)}"
+            observation.confidence = 0.3
+    
+    def _finalize_task_observation(
+        self,
+        observation: TaskObservation,
+        task: TaskNode,
+        context: Optional[Dict[str, Any]]
+    ) -> None:
+        """检查依赖和能力，并记录到观察上下文"""
         observation.dependencies_met = self._check_dependencies(task, context)
         observation.capability_available = self._check_capability(task)
         
-        # 4. 记录到观察上下文
         self.observation_context.task_observations.append(observation)
         
-        self.log_operation(
-            "observe_task_execution",
-            status="success",
-            task_id=task.task_id,
-            success=observation.success,
-            error_type=str(observation.error_type) if observation.error_type else None,
-            is_recoverable=observation.is_recoverable
-        )
-        
-        return observation
+        # 每次观察只在结束时记录一条日志；关闭日志时跳过参数构建
+        if self._log_enabled:
+            self.log_operation(
+                "observe_task_execution",
+                status="success",
+                task_id=task.task_id,
+                success=observation.success,
+                error_type=str(observation.error_type) if observation.error_type else None,
+                is_recoverable=observation.is_recoverable
+            )
     
     async def observe_plan_progress(
         self,
@@ -532,15 +783,21 @@ class ObserveModule(BaseModule):
         Returns:
             PlanObservation: 计划观察结果
         """
-        self.log_operation("observe_plan_progress", status="running")
-        
-        # 1. 统计任务状态
+        # 1. 统计任务状态（单次遍历，同时收集失败任务供阻塞分析使用）
         total_tasks = len(task_tree.tasks)
-        completed = sum(1 for t in task_tree.tasks.values() if t.status == TaskStatus.COMPLETED)
-        failed = sum(1 for t in task_tree.tasks.values() if t.status == TaskStatus.FAILED)
-        pending = sum(1 for t in task_tree.tasks.values() if t.status == TaskStatus.PENDING)
-        
-        observation = PlanObservation(
+        status_counts: Dict[str, int] = {}
+        failed_tasks: List[TaskNode] = []
+        for t in task_tree.tasks.values():
+            status = t.status
+            status_counts[status] = status_counts.get(status, 0) + 1
+            if status == TaskStatus.FAILED:
+                failed_tasks.append(t)
+        completed = status_counts.get(TaskStatus.COMPLETED, 0)
+        failed = len(failed_tasks)
+        pending = status_counts.get(TaskStatus.PENDING, 0)
+        
+        # 字段均由任务树统计得到，跳过校验
+        observation = PlanObservation.model_construct(
             plan_version=task_tree.plan_version,
             total_tasks=total_tasks,
             completed_tasks=completed,
@@ -558,7 +815,7 @@ class ObserveModule(BaseModule):
         )
         
         # 3. 识别阻塞因素
-        observation.blockers = self._identify_blockers(task_tree)
+        observation.blockers = self._identify_blockers(task_tree, failed_tasks)
         
         # 4. 分析进度趋势
         observation.is_making_progress = self._check_progress_trend(
@@ -572,13 +829,14 @@ class ObserveModule(BaseModule):
         # 5. 记录到观察上下文
         self.observation_context.plan_observations.append(observation)
         
-        self.log_operation(
-            "observe_plan_progress",
-            status="success",
-            progress=f"{observation.progress_rate:.1%}",
-            health=f"{observation.plan_health:.2f}",
-            trend=observation.failure_trend
-        )
+        if self._log_enabled:
+            self.log_operation(
+                "observe_plan_progress",
+                status="success",
+                progress=f"{observation.progress_rate:.1%}",
+                health=f"{observation.plan_health:.2f}",
+                trend=observation.failure_trend
+            )
         
         return observation
     
@@ -601,8 +859,6 @@ class ObserveModule(BaseModule):
         Returns:
             DecisionResult: 决策结果
         """
-        self.log_operation("decide_next_action", status="running")
-        
         # 执行决策矩阵
         decision = await self._evaluate_decision_matrix(
             task_observation,
@@ -611,61 +867,56 @@ class ObserveModule(BaseModule):
         )
         
         # 记录决策
-        self.observation_context.past_decisions.append(decision)
-        
-        self.log_operation(
-            "decide_next_action",
-            status="success",
-            action=decision.action.value,
-            reason=decision.reason[:100],  # 限制长度
-            confidence=f"{decision.confidence:.2f}"
-        )
+        self._record_decision(decision)
+        
+        if self._log_enabled:
+            self.log_operation(
+                "decide_next_action",
+                status="success",
+                action=decision.action.value,
+                reason=decision.reason[:100],  # 限制长度
+                confidence=f"{decision.confidence:.2f}"
+            )
         
         return decision
     
     # ===== 私有方法: 错误分析 ===== #
     
-    async def _classify_error(self, error_message: str) -> FailureType:
+    def _classify_error(self, error_message: str) -> FailureType:
         """
         分类错误类型
         
-        使用模式匹配进行快速分类
+        错误信息只转小写一次，再按 _ERROR_KEYWORDS 的顺序做子串匹配，
+        先命中的类型优先。子串查找比大小写不敏感的正则快一个数量级以上，
+        长错误信息（如完整堆栈）也只线性扫描。
         """
         error_lower = error_message.lower()
-        
-        # 模式匹配规则
-        if any(keyword in error_lower for keyword in ["timeout", "timed out", "time out"]):
-            return FailureType.TIMEOUT
-        
-        elif any(keyword in error_lower for keyword in ["not found", "missing", "unavailable"]):
-            return FailureType.CAPABILITY_MISSING
-        
-        elif any(keyword in error_lower for keyword in ["network", "connection", "unreachable"]):
-            return FailureType.TRANSIENT
-        
-        elif any(keyword in error_lower for keyword in ["validation", "invalid", "malformed"]):
-            return FailureType.VALIDATION_FAILED
-        
-        elif any(keyword in error_lower for keyword in ["dependency", "prerequisite"]):
-            return FailureType.DEPENDENCY_FAILED
-        
-        elif any(keyword in error_lower for keyword in ["parameter", "argument", "input"]):
-            return FailureType.PARAMETER_ERROR
-        
-        elif any(keyword in error_lower for keyword in ["config", "setup", "initialization"]):
-            return FailureType.SYSTEMATIC
-        
-        else:
-            return FailureType.UNKNOWN
+        for failure_type, keywords in _ERROR_KEYWORDS.items():
+            if any(keyword in error_lower for keyword in keywords):
+                return failure_type
+        return FailureType.UNKNOWN
     
     def _is_recoverable(self, error_type: FailureType) -> bool:
         """判断错误是否可恢复"""
-        recoverable_types = {
-            FailureType.TRANSIENT,
-            FailureType.TIMEOUT,
-            FailureType.PARAMETER_ERROR,
-        }
-        return error_type in recoverable_types
+        return error_type in _RECOVERABLE_TYPES
+    
+    def _get_root_cause_agent(self) -> 'Agent':
+        """获取根因分析 Agent（首次调用时构建并缓存）"""
+        agent = self._root_cause_agent
+        if agent is None:
+            if not _HAS_AGENTS_SDK:
+                raise RuntimeError(
+                    "OpenAI Agent SDK is required for root cause analysis. "
+                    "Install with: pip install openai-agents"
+                )
+            
+            agent = Agent(
+                name="RootCauseAnalyzer",
+                instructions=_ROOT_CAUSE_INSTRUCTIONS,
+                model=self.observe_model
+            )
+            self._root_cause_agent = agent
+        return agent
     
     async def _analyze_root_cause(
         self,
@@ -679,44 +930,24 @@ class ObserveModule(BaseModule):
         
         兼容OpenAI Agent SDK
         """
-        analysis_prompt = f"""Analyze the following task execution failure and provide root cause analysis.
-
-Task Information:
-- Description: {task.task_description}
-- Task ID: {task.task_id}
-- Error Type: {error_type.value}
-- Error Message: {error}
-
-Please provide:
-1. Root cause (what is the fundamental reason for failure?)
-2. Whether this is systematic or transient
-3. Confidence level (0.0-1.0)
-
-Respond in JSON format:
-{{
-    "root_cause": "brief explanation",
-    "is_systematic": true/false,
-    "confidence": 0.0-1.0
-}}
-"""
+        analysis_prompt = _ROOT_CAUSE_PROMPT.format(
+            task_description=task.task_description,
+            task_id=task.task_id,
+            error_type=error_type.value,
+            error=error
+        )
         
         try:
-            # 运行时导入
-            from agents import Agent, Runner
-            
-            # 使用OpenAI Agent SDK
-            agent = Agent(
-                name="RootCauseAnalyzer",
-                instructions="You are an expert at analyzing task execution failures. Be concise and precise.",
-                model=self.observe_model
+            # 使用OpenAI Agent SDK（Agent 只构建一次并复用）
+            result = await Runner.run(
+                starting_agent=self._get_root_cause_agent(),
+                input=analysis_prompt
             )
             
-            runner = Runner(agent)
-            result = await runner.run(analysis_prompt)
-            
             # 解析结果
             # TODO: 更robust的JSON解析
-            content = result if isinstance(result, str) else str(result)
+            output = getattr(result, "final_output", result)
+            content = output if isinstance(output, str) else str(output)
             
             return {
                 "root_cause": content[:200],  # 限制长度
@@ -742,109 +973,46 @@ Respond in JSON format:
         决策矩阵评估
         
         实现7条智能决策规则 + LLM兜底
+        
+        按错误类型的规则通过 _early_rules / _late_rules 查表分发，
+        计划级规则（4、5）与错误类型无关，位于两组规则之间。
+        规则返回 None 表示不适用，继续匹配后续规则。
+        
+        决策结果的字段均由本方法生成，使用 model_construct 跳过校验。
         """
         
         # ===== 规则1: 任务成功 → CONTINUE =====
         if task_obs.success:
-            return DecisionResult(
+            return DecisionResult.model_construct(
                 action=ActionType.CONTINUE,
                 reason="Task executed successfully, continue to next task",
                 confidence=1.0,
                 target_task_id=task_obs.task_id
             )
         
-        # ===== 规则2: 暂时性失败 + 未达重试上限 → RETRY =====
-        if (task_obs.error_type == FailureType.TRANSIENT or 
-            task_obs.error_type == FailureType.TIMEOUT):
-            
-            if task_obs.retry_count < self.observation_context.max_retries_per_task:
-                # 计算重试延迟（指数退避）
-                if self.config.exponential_backoff:
-                    retry_delay = min(
-                        self.config.base_retry_delay * (2 ** task_obs.retry_count),
-                        self.config.max_retry_delay
-                    )
-                else:
-                    retry_delay = self.config.base_retry_delay
-                
-                return DecisionResult(
-                    action=ActionType.RETRY,
-                    reason=f"{task_obs.error_type.value} failure, retry {task_obs.retry_count + 1}/{self.observation_context.max_retries_per_task}",
-                    confidence=0.8,
-                    target_task_id=task_obs.task_id,
-                    retry_delay=retry_delay
-                )
-        
-        # ===== 规则3: 能力缺失 → REPLAN_TASK =====
-        if task_obs.error_type == FailureType.CAPABILITY_MISSING:
-            return DecisionResult(
-                action=ActionType.REPLAN_TASK,
-                reason=f"Required capability not available for task {task_obs.task_id}",
-                confidence=0.9,
-                target_task_id=task_obs.task_id,
-                replan_scope="task"
-            )
-        
-        # ===== 规则4: 计划健康度低 → REPLAN_ALL =====
-        if plan_obs and plan_obs.plan_health < self.config.replan_threshold:
-            if self.observation_context.current_replan_count < self.observation_context.max_replans:
-                return DecisionResult(
-                    action=ActionType.REPLAN_ALL,
-                    reason=f"Plan health too low ({plan_obs.plan_health:.2f} < {self.config.replan_threshold}), full replan needed",
-                    confidence=0.85,
-                    replan_scope="all"
-                )
-            else:
-                # 达到重规划上限，上报
-                return DecisionResult(
-                    action=ActionType.ESCALATE,
-                    reason=f"Max replans reached ({self.observation_context.max_replans}), escalating to human",
-                    confidence=0.95
-                )
-        
-        # ===== 规则5: 失败率高 + 趋势恶化 → REPLAN_ALL =====
-        failure_rate = plan_obs.failed_tasks / max(plan_obs.total_tasks, 1)
-        if (failure_rate > self.config.failure_rate_threshold and
-            plan_obs.failure_trend == "degrading"):
-            
-            if self.observation_context.current_replan_count < self.observation_context.max_replans:
-                return DecisionResult(
-                    action=ActionType.REPLAN_ALL,
-                    reason=f"High failure rate ({failure_rate:.1%}) with degrading trend",
-                    confidence=0.75,
-                    replan_scope="all"
-                )
+        error_type = task_obs.error_type
         
-        # ===== 规则6: 依赖失败 → SKIP =====
-        if task_obs.error_type == FailureType.DEPENDENCY_FAILED:
-            return DecisionResult(
-                action=ActionType.SKIP,
-                reason="Task dependencies not met, skipping",
-                confidence=0.9,
-                target_task_id=task_obs.task_id
-            )
+        # ===== 规则2-3: 暂时性失败 / 能力缺失 =====
+        rule = self._early_rules.get(error_type)
+        if rule is not None:
+            decision = rule(task_obs)
+            if decision is not None:
+                return decision
         
-        # ===== 规则7: 系统性失败 → ESCALATE =====
-        if task_obs.error_type == FailureType.SYSTEMATIC:
-            return DecisionResult(
-                action=ActionType.ESCALATE,
-                reason=f"Systematic failure detected: {task_obs.root_cause or 'Unknown'}",
-                confidence=0.95,
-                target_task_id=task_obs.task_id
-            )
+        # ===== 规则4-5: 计划级规则 =====
+        if plan_obs is not None:
+            decision = self._rule_plan_health(plan_obs)
+            if decision is not None:
+                return decision
         
-        # ===== 规则8: 参数错误 → ADJUST_PARAMS =====
-        if task_obs.error_type == FailureType.PARAMETER_ERROR:
-            return DecisionResult(
-                action=ActionType.ADJUST_PARAMS,
-                reason="Parameter error detected, adjustment may help",
-                confidence=0.6,
-                target_task_id=task_obs.task_id
-            )
+        # ===== 规则6-8: 依赖失败 / 系统性失败 / 参数错误 =====
+        rule = self._late_rules.get(error_type)
+        if rule is not None:
+            return rule(task_obs)
         
         # ===== 保守模式: 更倾向于重规划 =====
-        if self.config.conservative_mode:
-            return DecisionResult(
+        if self._conservative_mode:
+            return DecisionResult.model_construct(
                 action=ActionType.REPLAN_ALL,
                 reason="Conservative mode: defaulting to replan for unknown failures",
                 confidence=0.5,
@@ -852,12 +1020,119 @@ Respond in JSON format:
             )
         
         # ===== 默认: CONTINUE (尝试继续) =====
-        return DecisionResult(
+        return DecisionResult.model_construct(
             action=ActionType.CONTINUE,
             reason="No clear recovery action, attempting to continue",
             confidence=0.3
         )
     
+    def _rule_retry(self, task_obs: TaskObservation) -> Optional[DecisionResult]:
+        """规则2: 暂时性失败 + 未达重试上限 → RETRY"""
+        if task_obs.retry_count >= self._max_retries_per_task:
+            return None
+        
+        # 重试延迟（指数退避时查预计算表，超出表范围再现算）
+        if self._exp_backoff:
+            retry_count = task_obs.retry_count
+            if 0 <= retry_count < len(self._retry_delays):
+                retry_delay = self._retry_delays[retry_count]
+            else:
+                retry_delay = self._compute_retry_delay(retry_count)
+        else:
+            retry_delay = self._base_retry_delay
+        
+        return DecisionResult.model_construct(
+            action=ActionType.RETRY,
+            reason=(
+                f"{task_obs.error_type.value} failure, "
+                f"retry {task_obs.retry_count + 1}/{self._max_retries_per_task}"
+            ),
+            confidence=0.8,
+            target_task_id=task_obs.task_id,
+            retry_delay=retry_delay
+        )
+    
+    def _compute_retry_delay(self, retry_count: int) -> float:
+        """指数退避的重试延迟：base * 2^retry_count，不超过 max_retry_delay"""
+        return min(
+            self._base_retry_delay * (2 ** retry_count),
+            self._max_retry_delay
+        )
+    
+    def _rule_replan_task(self, task_obs: TaskObservation) -> DecisionResult:
+        """规则3: 能力缺失 → REPLAN_TASK"""
+        return DecisionResult.model_construct(
+            action=ActionType.REPLAN_TASK,
+            reason=f"Required capability not available for task {task_obs.task_id}",
+            confidence=0.9,
+            target_task_id=task_obs.task_id,
+            replan_scope="task"
+        )
+    
+    def _rule_plan_health(self, plan_obs: PlanObservation) -> Optional[DecisionResult]:
+        """规则4-5: 计划健康度低 / 失败率高且趋势恶化 → REPLAN_ALL（或上报）"""
+        can_replan = self.observation_context.current_replan_count < self._max_replans
+        
+        # 规则4: 计划健康度低 → REPLAN_ALL
+        if plan_obs.plan_health < self._replan_threshold:
+            if can_replan:
+                return DecisionResult.model_construct(
+                    action=ActionType.REPLAN_ALL,
+                    reason=(
+                        f"Plan health too low ({plan_obs.plan_health:.2f} < "
+                        f"{self._replan_threshold}), full replan needed"
+                    ),
+                    confidence=0.85,
+                    replan_scope="all"
+                )
+            # 达到重规划上限，上报
+            return DecisionResult.model_construct(
+                action=ActionType.ESCALATE,
+                reason=f"Max replans reached ({self._max_replans}), escalating to human",
+                confidence=0.95
+            )
+        
+        # 规则5: 失败率高 + 趋势恶化 → REPLAN_ALL
+        failure_rate = plan_obs.failed_tasks / max(plan_obs.total_tasks, 1)
+        if (can_replan and
+            failure_rate > self._failure_rate_threshold and
+            plan_obs.failure_trend == "degrading"):
+            return DecisionResult.model_construct(
+                action=ActionType.REPLAN_ALL,
+                reason=f"High failure rate ({failure_rate:.1%}) with degrading trend",
+                confidence=0.75,
+                replan_scope="all"
+            )
+        
+        return None
+    
+    def _rule_skip(self, task_obs: TaskObservation) -> DecisionResult:
+        """规则6: 依赖失败 → SKIP"""
+        return DecisionResult.model_construct(
+            action=ActionType.SKIP,
+            reason="Task dependencies not met, skipping",
+            confidence=0.9,
+            target_task_id=task_obs.task_id
+        )
+    
+    def _rule_escalate(self, task_obs: TaskObservation) -> DecisionResult:
+        """规则7: 系统性失败 → ESCALATE"""
+        return DecisionResult.model_construct(
+            action=ActionType.ESCALATE,
+            reason=f"Systematic failure detected: {task_obs.root_cause or 'Unknown'}",
+            confidence=0.95,
+            target_task_id=task_obs.task_id
+        )
+    
+    def _rule_adjust_params(self, task_obs: TaskObservation) -> DecisionResult:
+        """规则8: 参数错误 → ADJUST_PARAMS"""
+        return DecisionResult.model_construct(
+            action=ActionType.ADJUST_PARAMS,
+            reason="Parameter error detected, adjustment may help",
+            confidence=0.6,
+            target_task_id=task_obs.task_id
+        )
+    
     # ===== 私有方法: 计划分析 ===== #
     
     def _calculate_plan_health(
@@ -876,25 +1151,43 @@ Respond in JSON format:
         if total == 0:
             return 1.0
         
-        health = (completed * 1.0 + pending * 0.5 - failed * 0.5) / total
-        return max(0.0, min(1.0, health))
+        # 整数先相减再乘 0.5，省去两次 int→float 乘法；
+        # 钳位用比较代替 max/min 调用
+        health = (completed + 0.5 * (pending - failed)) / total
+        if health < 0.0:
+            return 0.0
+        if health > 1.0:
+            return 1.0
+        return health
     
-    def _identify_blockers(self, task_tree: TaskTree) -> List[str]:
-        """识别阻塞因素"""
+    def _identify_blockers(
+        self,
+        task_tree: TaskTree,
+        failed_tasks: Optional[List[TaskNode]] = None
+    ) -> List[str]:
+        """
+        识别阻塞因素
+        
+        Args:
+            task_tree: 任务树
+            failed_tasks: 已收集的失败任务（None 则从任务树中查找）
+        """
         blockers = []
         
         # 找出失败的任务
-        failed_tasks = [
-            t for t in task_tree.tasks.values()
-            if t.status == TaskStatus.FAILED
-        ]
+        if failed_tasks is None:
+            failed_tasks = [
+                t for t in task_tree.tasks.values()
+                if t.status == TaskStatus.FAILED
+            ]
+        
+        if not failed_tasks:
+            return blockers
         
+        dependents = self._get_dependent_counts(task_tree)
         for failed_task in failed_tasks:
-            # 找出依赖这个失败任务的其他任务
-            dependent_count = sum(
-                1 for t in task_tree.tasks.values()
-                if failed_task.task_id in t.dependencies
-            )
+            # 依赖这个失败任务的其他任务数
+            dependent_count = dependents.get(failed_task.task_id, 0)
             
             if dependent_count > 0:
                 blockers.append(
@@ -903,9 +1196,30 @@ Respond in JSON format:
         
         return blockers
     
+    def _get_dependent_counts(self, task_tree: TaskTree) -> Dict[str, int]:
+        """
+        获取反向依赖索引：task_id → 依赖它的任务数
+        
+        依赖关系在规划时确定，重规划会生成新的任务树并递增 plan_version，
+        因此按 (任务树, plan_version, 任务数) 缓存最近一次的索引。
+        """
+        key = (task_tree.plan_version, len(task_tree.tasks))
+        if self._dependents_tree is task_tree and self._dependents_key == key:
+            return self._dependents_index
+        
+        index: Dict[str, int] = {}
+        for t in task_tree.tasks.values():
+            for dep_id in set(t.dependencies):
+                index[dep_id] = index.get(dep_id, 0) + 1
+        
+        self._dependents_tree = task_tree
+        self._dependents_key = key
+        self._dependents_index = index
+        return index
+    
     def _check_progress_trend(
         self,
-        plan_observations: List[PlanObservation]
+        plan_observations: Sequence[PlanObservation]
     ) -> bool:
         """检查是否在进步"""
         if len(plan_observations) < 2:
@@ -918,7 +1232,7 @@ Respond in JSON format:
     
     def _analyze_failure_trend(
         self,
-        task_observations: List[TaskObservation]
+        task_observations: Sequence[TaskObservation]
     ) -> str:
         """
         分析失败趋势
@@ -929,24 +1243,19 @@ Respond in JSON format:
         if len(task_observations) < 3:
             return "stable"
         
-        # 取最近5个观察
-        recent_obs = task_observations[-min(5, len(task_observations)):]
+        # 取最近5个观察的失败标记（历史记录是 deque，不支持切片）
+        failed = [not obs.success for obs in islice(reversed(task_observations), 5)]
+        failed.reverse()
         
-        # 计算失败率
-        failure_counts = []
+        # 趋势比较首尾两个大小为3的滑动窗口的失败数；两窗口重叠的部分
+        # 相互抵消，只需比较最早与最近的 len-3 个观察
         window_size = 3
-        
-        for i in range(len(recent_obs) - window_size + 1):
-            window = recent_obs[i:i + window_size]
-            failures = sum(1 for obs in window if not obs.success)
-            failure_counts.append(failures)
-        
-        if len(failure_counts) < 2:
+        edge = len(failed) - window_size
+        if edge < 1:
             return "stable"
         
-        # 计算趋势（最近 vs 最早）
-        recent_failures = failure_counts[-1]
-        early_failures = failure_counts[0]
+        early_failures = sum(failed[:edge])
+        recent_failures = sum(failed[-edge:])
         
         if recent_failures < early_failures:
             return "improving"
@@ -984,20 +1293,43 @@ Respond in JSON format:
             "decision_distribution": self._get_decision_distribution()
         }
     
+    def _record_decision(self, decision: DecisionResult) -> None:
+        """
+        记录决策到历史，并增量维护决策分布计数
+        
+        历史窗口已满时，append 会挤出最早的决策，其计数同步扣除，
+        使分布始终与保留的 past_decisions 一致。
+        """
+        past_decisions = self.observation_context.past_decisions
+        counts = self._decision_counts
+        if len(past_decisions) == past_decisions.maxlen:
+            evicted = past_decisions[0].action.value
+            counts[evicted] -= 1
+            if not counts[evicted]:
+                del counts[evicted]
+        past_decisions.append(decision)
+        counts[decision.action.value] += 1
+    
     def _get_decision_distribution(self) -> Dict[str, int]:
-        """获取决策分布统计"""
-        distribution = {}
-        for decision in self.observation_context.past_decisions:
-            action = decision.action.value
-            distribution[action] = distribution.get(action, 0) + 1
-        return distribution
+        """获取决策分布统计（O(1)，由 _record_decision 增量维护）"""
+        return dict(self._decision_counts)
+    
+    def _reset_module_state(self) -> None:
+        """复用时清空观察历史、决策统计与依赖索引"""
+        self.reset()
+        self._dependents_tree = None
+        self._dependents_key = None
+        self._dependents_index = {}
     
     def reset(self):
         """重置观察上下文"""
         self.observation_context = ObservationContext(
             current_iteration=0,
-            max_iterations=self.observation_context.max_iterations
+            max_iterations=self.observation_context.max_iterations,
+            history_window=self.observation_context.history_window
         )
+        self._decision_counts.clear()
+        self.invalidate_config_cache()
         _logger.info("ObservationContext reset")
 
 
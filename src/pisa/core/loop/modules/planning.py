@@ -15,15 +15,19 @@ Planning Module (Refactored v4.0)
 - 继承 BaseModule，支持配置透传和可观测性
 """
 
+import asyncio
+import hashlib
+import heapq
 import logging
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pisa.core.loop.state import LoopState
     from pisa.core.loop.context import LoopContext
 
-from pisa.core.planning import Planner, Replanner, TaskTree, TaskNode, TaskStatus
-from .base import BaseModule, PlanningModuleConfig
+from pisa.core.planning import TaskTree, TaskNode, TaskStatus
+from .base import BaseModule, PlanningModuleConfig, METADATA_PATCH_KEY, _cache_key_part
 
 _logger = logging.getLogger(__name__)
 
@@ -48,10 +52,36 @@ class PlanningModule(BaseModule):
     - 严格遵循 OpenAI Agent SDK
     """
     
+    # 本类实例属性使用 slot 存储；保留 __dict__ 供混入类的缓存及调用方
+    # 附加属性使用（未用到时 __dict__ 不会被创建）
+    __slots__ = (
+        "__dict__",
+        "_caps_cache",
+        "_caps_registry",
+        "_caps_version",
+        "_completed_cache",
+        "_dependents",
+        "_dependents_key",
+        "_dependents_tree",
+        "_plan_cache",
+        "_ready_dependents",
+        "_ready_heap",
+        "_ready_key",
+        "_ready_ranks",
+        "_ready_remaining",
+        "_ready_tree",
+        "_replan_cache",
+        "_status_cache_key",
+        "_status_cache_tree",
+        "current_tree",
+        "planner",
+        "replanner",
+    )
+    
     # ==================== 依赖声明 ====================
     
     STATE_REQUIRES = ['input']  # 默认需要input来创建计划
-    STATE_PRODUCES = ['plan', 'metadata']
+    STATE_PRODUCES = ['plan', 'metadata']  # metadata 通过 metadata_patch 增量更新
     
     # ==================== 初始化 ====================
     
@@ -95,7 +125,9 @@ class PlanningModule(BaseModule):
         planning_model = config.planning_model or self.model
         replanning_model = config.replanning_model or self.model
         
-        # 创建 Planner 和 Replanner
+        # 创建 Planner 和 Replanner（规划栈在首次实例化时才导入）
+        from pisa.core.planning import Planner, Replanner
+        
         self.planner = Planner(
             instructions=planning_instructions,
             model=planning_model,
@@ -111,6 +143,33 @@ class PlanningModule(BaseModule):
         # 当前任务树（可能为空）
         self.current_tree: Optional[TaskTree] = None
         
+        # capability 名称列表缓存，按 (registry, version) 失效（见 _list_capabilities）
+        self._caps_cache: Optional[List[str]] = None
+        self._caps_registry: Optional[Any] = None
+        self._caps_version: Optional[int] = None
+        
+        # 计划缓存：key → 未执行过的任务树副本（见 _create_plan_cached）
+        self._plan_cache: "OrderedDict[str, TaskTree]" = OrderedDict()
+        
+        # should_replan / is_plan_completed 的结果缓存（见 _status_cache）
+        self._status_cache_tree: Optional[TaskTree] = None
+        self._status_cache_key: Optional[tuple] = None
+        self._completed_cache: Optional[bool] = None
+        self._replan_cache: Dict[int, bool] = {}
+        
+        # 就绪任务队列（见 _get_ready_heap），按任务树与版本失效
+        self._ready_tree: Optional[TaskTree] = None
+        self._ready_key: Optional[tuple] = None
+        self._ready_heap: List[Tuple[int, str]] = []
+        self._ready_remaining: Dict[str, int] = {}
+        self._ready_dependents: Dict[str, List[str]] = {}
+        self._ready_ranks: Dict[str, int] = {}
+        
+        # 完整的反向依赖表（见 get_dependents），失效条件与就绪队列相同
+        self._dependents_tree: Optional[TaskTree] = None
+        self._dependents_key: Optional[tuple] = None
+        self._dependents: Dict[str, List[str]] = {}
+        
         self.logger.info(
             "PlanningModule initialized",
             planning_model=planning_model,
@@ -128,6 +187,24 @@ class PlanningModule(BaseModule):
             "initialized": False,
         }
     
+    def _list_capabilities(self, cap_registry: Any) -> List[str]:
+        """
+        获取 registry 中的 capability 名称列表（按 registry 版本缓存）
+        
+        调用方不应修改返回的列表。registry 没有 version 属性时每次重新获取。
+        """
+        version = getattr(cap_registry, "version", None)
+        if version is None:
+            return cap_registry.list_all()
+        
+        if (self._caps_cache is None
+                or self._caps_registry is not cap_registry
+                or self._caps_version != version):
+            self._caps_cache = cap_registry.list_all()
+            self._caps_registry = cap_registry
+            self._caps_version = version
+        return self._caps_cache
+    
     # ==================== 新接口（State → State）====================
     
     async def _execute(self, state: 'LoopState') -> Dict[str, Any]:
@@ -151,7 +228,7 @@ class PlanningModule(BaseModule):
             cap_registry = getattr(self.loop, 'capability_registry', None)
             
             if cap_registry:
-                available_capabilities = cap_registry.list_all()
+                available_capabilities = self._list_capabilities(cap_registry)
                 _logger.info(f"📋 Got {len(available_capabilities)} capabilities from registry")
             else:
                 _logger.warning("⚠️ No capability_registry found in loop")
@@ -160,15 +237,15 @@ class PlanningModule(BaseModule):
         
         # 调用planner创建计划（传递available capabilities）
         _logger.info(f"🎯 Calling planner.create_plan with {len(available_capabilities)} capabilities")
-        task_tree = await self.planner.create_plan(
+        task_tree = await self._create_plan_cached(
             goal=task_description,
             context=task_detail_info,
             available_capabilities=available_capabilities  # ← 关键：传递可用capabilities
         )
         
         # 更新统计
-        self.stats["plans_created"] = self.stats.get("plans_created", 0) + 1
-        self.stats["total_tasks_planned"] = self.stats.get("total_tasks_planned", 0) + len(task_tree.tasks)
+        self.stats["plans_created"] += 1
+        self.stats["total_tasks_planned"] += len(task_tree.tasks)
         
         # 保存当前任务树
         self.current_tree = task_tree
@@ -180,10 +257,10 @@ class PlanningModule(BaseModule):
                 content=f"Created plan with {len(task_tree.tasks)} tasks"
             )
         
+        # metadata 只返回增量，由 _update_state 合并
         return {
             "plan": task_tree,
-            "metadata": {
-                **state.metadata,
+            METADATA_PATCH_KEY: {
                 "planning": {
                     "total_tasks": len(task_tree.tasks),
                     "plan_created": True
@@ -212,23 +289,18 @@ class PlanningModule(BaseModule):
                 failed_tasks = state.result.failed_tasks
         
         # 调用replanner（使用真实的方法签名）
-        new_tree = await self.replanner.replan(
-            original_plan=state.plan,
+        new_tree = self._coerce_tree(await self.replanner.replan(
+            original_plan=self._coerce_tree(state.plan),
             failed_tasks=failed_tasks
-        )
+        ))
         
         # 更新统计
-        self.stats["replans_triggered"] = self.stats.get("replans_triggered", 0) + 1
+        self.stats["replans_triggered"] += 1
         
         # 保存当前任务树
         self.current_tree = new_tree
         
-        # 获取任务数量（兼容dict和TaskTree）
-        num_tasks = 0
-        if isinstance(new_tree, dict):
-            num_tasks = len(new_tree.get('tasks', {}))
-        else:
-            num_tasks = len(getattr(new_tree, 'tasks', {}))
+        num_tasks = len(new_tree.tasks)
         
         # 更新到Context（可选）
         if self.context:
@@ -239,8 +311,7 @@ class PlanningModule(BaseModule):
         
         return state.with_update(
             plan=new_tree,
-            metadata={
-                **state.metadata,
+            metadata=state.metadata | {
                 "planning": {
                     "total_tasks": num_tasks,  # 使用前面计算好的值
                     "replanned": True
@@ -248,6 +319,18 @@ class PlanningModule(BaseModule):
             }
         )
     
+    @staticmethod
+    def _coerce_tree(plan: Any) -> TaskTree:
+        """
+        将 plan 统一为 TaskTree
+        
+        LoopState.with_update 经 model_dump() 后 plan 可能是字典，
+        在边界处转换一次，之后的逻辑只处理 TaskTree。
+        """
+        if isinstance(plan, TaskTree):
+            return plan
+        return TaskTree.model_validate(plan)
+    
     # ==================== 保留的业务逻辑 ====================
     
     async def _replan_legacy(
@@ -313,7 +396,7 @@ class PlanningModule(BaseModule):
         self.log_operation("create_plan", status="running", goal=goal)
         
         # 使用 Planner 创建计划
-        task_tree = await self.planner.create_plan(
+        task_tree = await self._create_plan_cached(
             goal=goal,
             context=context,
             available_capabilities=available_capabilities
@@ -335,6 +418,57 @@ class PlanningModule(BaseModule):
         
         return task_tree
     
+    async def _create_plan_cached(
+        self,
+        goal: str,
+        context: Optional[Dict[str, Any]],
+        available_capabilities: Optional[List[str]]
+    ) -> TaskTree:
+        """
+        创建计划，相同 (goal, capabilities, context) 复用缓存的计划
+        
+        缓存大小由 plan_cache_size 控制（0 表示不缓存）。缓存中保存的是
+        未执行过的任务树副本，每次命中返回新的深拷贝，执行过程中对
+        任务状态的修改不会影响缓存。
+        """
+        cache_size = self.config.plan_cache_size
+        if not cache_size:
+            return await self.planner.create_plan(
+                goal=goal,
+                context=context,
+                available_capabilities=available_capabilities
+            )
+        
+        key = hashlib.blake2b(
+            "\x1f".join((
+                goal,
+                ",".join(sorted(available_capabilities or ())),
+                _cache_key_part(context or {}),
+            )).encode(),
+            digest_size=16
+        ).hexdigest()
+        
+        cache = self._plan_cache
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+            _logger.info(f"Plan cache hit for goal: {goal}")
+            return cached.model_copy(deep=True)
+        
+        task_tree = await self.planner.create_plan(
+            goal=goal,
+            context=context,
+            available_capabilities=available_capabilities
+        )
+        
+        # 空计划通常意味着规划输出解析失败，不缓存，下次重新规划
+        if task_tree.tasks:
+            cache[key] = task_tree.model_copy(deep=True)
+            while len(cache) > cache_size:
+                cache.popitem(last=False)
+        
+        return task_tree
+    
     async def replan_on_failure(
         self,
         failed_task: TaskNode,
@@ -434,17 +568,253 @@ class PlanningModule(BaseModule):
         
         return refined_tree
     
+    async def replan_multi(
+        self,
+        triggers: List[Dict[str, Any]]
+    ) -> TaskTree:
+        """
+        并发尝试多个重规划触发，采用最先完成的有效结果
+        
+        各触发相互独立（都基于当前任务树），重规划调用并发执行，
+        同时进行的调用数受 max_parallel_replans 限制。第一个返回新任务树
+        的调用胜出，其余调用被取消；总耗时取决于最快的有效重规划，
+        而不是各次 LLM 调用耗时之和。
+        
+        Args:
+            triggers: 触发列表，每个包含 type（failure/block/discovery）
+                以及对应 replan_on_* 方法的参数，例如
+                {"type": "block", "blocked_tasks": [...], "reason": "..."}
+            
+        Returns:
+            更新后的任务树（所有重规划均未产生新计划时返回当前任务树）
+            
+        Raises:
+            ValueError: 没有当前任务树或触发类型未知
+        """
+        if self.current_tree is None:
+            raise ValueError("No current task tree to replan")
+        
+        dispatch = {
+            "failure": self.replanner.replan_on_failure,
+            "block": self.replanner.replan_on_block,
+            "discovery": self.replanner.replan_on_discovery,
+        }
+        
+        # 先校验全部触发，避免部分调用已发出后才报错
+        calls = []
+        for trigger in triggers:
+            trigger_type = trigger.get("type")
+            method = dispatch.get(trigger_type)
+            if method is None:
+                raise ValueError(f"Unknown replan trigger type: {trigger_type}")
+            arguments = {k: v for k, v in trigger.items() if k != "type"}
+            calls.append((trigger_type, method, arguments))
+        
+        base_tree = self.current_tree
+        semaphore = asyncio.Semaphore(self.config.max_parallel_replans)
+        
+        _logger.info(f"Replanning with {len(calls)} concurrent triggers")
+        
+        async def _run(trigger_type: str, method, arguments: Dict[str, Any]):
+            async with semaphore:
+                return trigger_type, await method(task_tree=base_tree, **arguments)
+        
+        tasks = [asyncio.create_task(_run(*call)) for call in calls]
+        refined_tree = None
+        try:
+            for future in asyncio.as_completed(tasks):
+                try:
+                    trigger_type, tree = await future
+                except Exception as e:
+                    _logger.warning(f"Replan attempt failed: {e}")
+                    continue
+                
+                # refine_plan 失败时返回原任务树，视为无效结果
+                if tree is not base_tree:
+                    refined_tree = tree
+                    _logger.info(f"Replan accepted from '{trigger_type}' trigger")
+                    break
+        finally:
+            # 取消其余仍在进行的重规划，并等待其结束
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if refined_tree is None:
+            _logger.warning("No replan produced a new plan, keeping current tree")
+            return base_tree
+        
+        self.current_tree = refined_tree
+        self.stats["replans_triggered"] += 1
+        
+        _logger.info(f"Plan refined to version {refined_tree.plan_version}")
+        
+        return refined_tree
+    
     def get_next_task(self) -> Optional[TaskNode]:
         """
         获取下一个要执行的任务
         
+        从就绪队列堆顶取任务（不出队，重复调用返回同一任务），
+        已不再是 PENDING 的条目在此惰性丢弃。任务状态在本模块之外被
+        修改时队列会重建（见 _get_ready_heap），结果与
+        TaskTree.get_next_task 一致。
+        
         Returns:
             下一个任务，如果没有则返回 None
         """
-        if self.current_tree is None:
+        tree = self.current_tree
+        if tree is None:
             return None
         
-        return self.current_tree.get_next_task()
+        heap = self._get_ready_heap(tree)
+        tasks = tree.tasks
+        while heap:
+            task = tasks.get(heap[0][1])
+            if self._is_dispatchable(tasks, task):
+                return task
+            heapq.heappop(heap)
+        return None
+    
+    def get_ready_batch(self) -> List[TaskNode]:
+        """
+        获取当前所有可执行的任务
+        
+        返回就绪队列中全部依赖已满足的 PENDING 任务，按与 get_next_task
+        相同的优先级排序（不出队），供执行器并行分发同一批任务。
+        宽计划中各分支互不依赖的任务会在同一批次返回。
+        
+        Returns:
+            就绪任务列表，没有时返回空列表
+        """
+        tree = self.current_tree
+        if tree is None:
+            return []
+        
+        heap = self._get_ready_heap(tree)
+        tasks = tree.tasks
+        entries = sorted(
+            entry for entry in heap
+            if self._is_dispatchable(tasks, tasks.get(entry[1]))
+        )
+        if len(entries) != len(heap):
+            # 堆有序列表本身满足堆性质，直接替换以丢弃失效条目
+            heap[:] = entries
+        
+        return [tasks[task_id] for _, task_id in entries]
+    
+    @staticmethod
+    def _is_dispatchable(tasks: Dict[str, TaskNode], task: Optional[TaskNode]) -> bool:
+        """任务仍为 PENDING 且所有依赖均已完成"""
+        return task is not None and task.status == TaskStatus.PENDING and all(
+            dep_id in tasks and tasks[dep_id].status == TaskStatus.COMPLETED
+            for dep_id in task.dependencies
+        )
+    
+    def _get_ready_heap(self, tree: TaskTree) -> List[Tuple[int, str]]:
+        """
+        获取任务树的就绪任务堆，必要时重建
+        
+        堆元素为 (优先级, task_id)：优先级取任务在 execution_order 中的
+        位置，不在其中的任务排在之后并保持任务字典顺序，与
+        TaskTree.get_next_task 的选择顺序一致。同时记录每个待执行任务
+        尚未完成的依赖数、优先级与反向依赖表，mark_task_completed
+        只需更新完成任务的后继。
+        
+        任务树对象、版本、任务数或 TaskNode.status_epoch() 变化时重建，
+        因此能发现绕过本模块直接修改的任务状态；本模块 mark_task_* 方法
+        造成的状态变化则就地增量更新，不触发重建。
+        """
+        if self._ready_heap_synced(tree):
+            return self._ready_heap
+        key = self._ready_heap_key(tree)
+        
+        order_rank: Dict[str, int] = {}
+        for position, task_id in enumerate(tree.execution_order):
+            order_rank.setdefault(task_id, position)
+        unordered_base = len(tree.execution_order)
+        
+        completed = {
+            task_id for task_id, task in tree.tasks.items()
+            if task.status == TaskStatus.COMPLETED
+        }
+        
+        heap: List[Tuple[int, str]] = []
+        remaining: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = {}
+        ranks: Dict[str, int] = {}
+        for index, (task_id, task) in enumerate(tree.tasks.items()):
+            if task.status != TaskStatus.PENDING:
+                continue
+            rank = order_rank.get(task_id, unordered_base + index)
+            missing = {dep_id for dep_id in task.dependencies if dep_id not in completed}
+            if missing:
+                remaining[task_id] = len(missing)
+                ranks[task_id] = rank
+                for dep_id in missing:
+                    dependents.setdefault(dep_id, []).append(task_id)
+            else:
+                heap.append((rank, task_id))
+        heapq.heapify(heap)
+        
+        self._ready_tree = tree
+        self._ready_key = key
+        self._ready_heap = heap
+        self._ready_remaining = remaining
+        self._ready_dependents = dependents
+        self._ready_ranks = ranks
+        return heap
+    
+    @staticmethod
+    def _ready_heap_key(tree: TaskTree) -> tuple:
+        """就绪队列的失效键"""
+        return (tree.plan_version, len(tree.tasks), TaskNode.status_epoch())
+    
+    def _ready_heap_synced(self, tree: TaskTree) -> bool:
+        """就绪队列是否与任务树当前状态一致"""
+        return self._ready_tree is tree and self._ready_key == self._ready_heap_key(tree)
+    
+    def _release_dependents(self, task_id: str) -> None:
+        """任务完成后，递减其后继的未完成依赖数，归零者入就绪队列"""
+        remaining = self._ready_remaining
+        for dependent_id in self._ready_dependents.pop(task_id, ()):
+            count = remaining.get(dependent_id)
+            if count is None:
+                continue
+            if count > 1:
+                remaining[dependent_id] = count - 1
+                continue
+            del remaining[dependent_id]
+            heapq.heappush(self._ready_heap, (self._ready_ranks.pop(dependent_id), dependent_id))
+    
+    def get_dependents(self, task_id: str) -> List[str]:
+        """
+        获取直接依赖指定任务的任务ID列表
+        
+        反向依赖表在每个计划版本上只构建一次（遍历全部依赖边），之后的
+        查询只需字典查找，适合沿依赖链传播失败/阻塞。调用方不应修改
+        返回的列表。
+        
+        Args:
+            task_id: 任务ID
+        
+        Returns:
+            依赖该任务的任务ID列表（按任务字典顺序），没有时返回空列表
+        """
+        tree = self.current_tree
+        if tree is None:
+            return []
+        
+        key = (tree.plan_version, len(tree.tasks))
+        if self._dependents_tree is not tree or self._dependents_key != key:
+            dependents: Dict[str, List[str]] = {}
+            for dependent_id, task in tree.tasks.items():
+                for dep_id in task.dependencies:
+                    dependents.setdefault(dep_id, []).append(dependent_id)
+            self._dependents_tree = tree
+            self._dependents_key = key
+            self._dependents = dependents
+        return self._dependents.get(task_id, [])
     
     def mark_task_completed(
         self,
@@ -463,9 +833,15 @@ class PlanningModule(BaseModule):
         if self.current_tree is None:
             raise ValueError("No current task tree")
         
-        task = self.current_tree.get_task(task_id)
+        tree = self.current_tree
+        task = tree.get_task(task_id)
         if task:
+            # 修改前就绪队列与任务树一致时增量更新，否则留待下次访问时重建
+            synced = self._ready_heap_synced(tree)
             task.mark_completed(result=result, agent_output=agent_output)
+            if synced:
+                self._ready_key = self._ready_heap_key(tree)
+                self._release_dependents(task_id)
             _logger.info(f"Task marked as completed: {task_id}")
         else:
             _logger.warning(f"Task not found: {task_id}")
@@ -481,9 +857,14 @@ class PlanningModule(BaseModule):
         if self.current_tree is None:
             raise ValueError("No current task tree")
         
-        task = self.current_tree.get_task(task_id)
+        tree = self.current_tree
+        task = tree.get_task(task_id)
         if task:
+            # 失败任务由堆顶惰性丢弃，队列无需重建
+            synced = self._ready_heap_synced(tree)
             task.mark_failed(error=error)
+            if synced:
+                self._ready_key = self._ready_heap_key(tree)
             _logger.error(f"Task marked as failed: {task_id} - {error}")
         else:
             _logger.warning(f"Task not found: {task_id}")
@@ -498,10 +879,15 @@ class PlanningModule(BaseModule):
         if self.current_tree is None:
             raise ValueError("No current task tree")
         
-        task = self.current_tree.get_task(task_id)
+        tree = self.current_tree
+        task = tree.get_task(task_id)
         if task:
+            # 运行中的任务由堆顶惰性丢弃，队列无需重建
+            synced = self._ready_heap_synced(tree)
             task.mark_running()
-            self.current_tree.current_task_id = task_id
+            if synced:
+                self._ready_key = self._ready_heap_key(tree)
+            tree.current_task_id = task_id
             _logger.info(f"Task marked as running: {task_id}")
         else:
             _logger.warning(f"Task not found: {task_id}")
@@ -516,13 +902,19 @@ class PlanningModule(BaseModule):
         Returns:
             是否应该重新规划
         """
-        if self.current_tree is None:
+        tree = self.current_tree
+        if tree is None:
             return False
         
-        return self.replanner.should_replan(
-            task_tree=self.current_tree,
-            failure_threshold=failure_threshold
-        )
+        cache = self._status_cache(tree)
+        result = cache.get(failure_threshold)
+        if result is None:
+            result = self.replanner.should_replan(
+                task_tree=tree,
+                failure_threshold=failure_threshold
+            )
+            cache[failure_threshold] = result
+        return result
     
     def get_tree_statistics(self) -> Dict[str, Any]:
         """
@@ -547,10 +939,55 @@ class PlanningModule(BaseModule):
     
     def is_plan_completed(self) -> bool:
         """判断计划是否已完成"""
-        if self.current_tree is None:
+        tree = self.current_tree
+        if tree is None:
             return False
         
-        return self.current_tree.is_completed()
+        self._status_cache(tree)
+        if self._completed_cache is None:
+            self._completed_cache = tree.is_completed()
+        return self._completed_cache
+    
+    def _status_cache(self, tree: TaskTree) -> Dict[int, bool]:
+        """
+        校验 should_replan / is_plan_completed 的结果缓存，返回 should_replan 缓存
+        
+        缓存键为 (任务树对象, plan_version, 任务数, TaskNode.status_epoch())：
+        任何任务状态被修改（包括绕过本模块直接给 TaskNode.status 赋值）
+        时失效。
+        """
+        key = (tree.plan_version, len(tree.tasks), TaskNode.status_epoch())
+        if self._status_cache_tree is not tree or self._status_cache_key != key:
+            self._status_cache_tree = tree
+            self._status_cache_key = key
+            self._completed_cache = None
+            self._replan_cache = {}
+        return self._replan_cache
+    
+    def invalidate_status_cache(self) -> None:
+        """丢弃 should_replan / is_plan_completed 的缓存结果"""
+        self._status_cache_tree = None
+    
+    def _reset_module_state(self) -> None:
+        """复用时丢弃当前计划及其派生索引、计划缓存"""
+        self.current_tree = None
+        self._caps_cache = None
+        self._caps_registry = None
+        self._caps_version = None
+        self._plan_cache.clear()
+        self._status_cache_tree = None
+        self._status_cache_key = None
+        self._completed_cache = None
+        self._replan_cache = {}
+        self._ready_tree = None
+        self._ready_key = None
+        self._ready_heap = []
+        self._ready_remaining = {}
+        self._ready_dependents = {}
+        self._ready_ranks = {}
+        self._dependents_tree = None
+        self._dependents_key = None
+        self._dependents = {}
     
     def get_current_tree(self) -> Optional[TaskTree]:
         """获取当前任务树"""
@@ -220,11 +220,11 @@ Return a JSON object:
         )
         
         # 更新统计
-        self.stats["reflections_performed"] = self.stats.get("reflections_performed", 0) + 1
+        self.stats["reflections_performed"] += 1
         if reflection_result.identified_issues:
-            self.stats["issues_identified"] = self.stats.get("issues_identified", 0) + len(reflection_result.identified_issues)
+            self.stats["issues_identified"] += len(reflection_result.identified_issues)
         if reflection_result.improvements:
-            self.stats["improvements_suggested"] = self.stats.get("improvements_suggested", 0) + len(reflection_result.improvements)
+            self.stats["improvements_suggested"] += len(reflection_result.improvements)
         
         # 更新到Context（可选）
         if self.context:
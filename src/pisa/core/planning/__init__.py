@@ -4,9 +4,20 @@ Planning Package
 任务规划相关的核心模块。
 """
 
+from typing import Any
+
 from .task_tree import TaskTree, TaskNode, TaskStatus
-from .planner import Planner
-from .replanner import Replanner
+
+
+def __getattr__(name: str) -> Any:
+    """Planner / Replanner 在首次访问时才导入"""
+    if name == "Planner":
+        from .planner import Planner
+        return Planner
+    if name == "Replanner":
+        from .replanner import Replanner
+        return Replanner
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "TaskTree",
@@ -9,7 +9,7 @@ Task Tree
 - 支持任务依赖和状态管理
 """
 
-from typing import List, Dict, Any, Optional, Literal
+from typing import List, Dict, Any, Optional, Literal, ClassVar
 from datetime import datetime
 from enum import Enum
 from pydantic import BaseModel, Field
@@ -74,6 +74,48 @@ class TaskNode(BaseModel):
     # 元数据
     metadata: Dict[str, Any] = Field(default_factory=dict, description="额外的元数据")
     
+    # 所有节点共享的状态修改计数（见 status_epoch）
+    _status_epoch: ClassVar[int] = 0
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """给 status 赋值时递增状态修改计数"""
+        if name == "status":
+            TaskNode.bump_status_epoch()
+        super().__setattr__(name, value)
+    
+    @classmethod
+    def status_epoch(cls) -> int:
+        """
+        任务状态修改计数
+        
+        任何节点的 status 被赋值（包括直接赋值）、任务被加入任务树或
+        新增依赖时递增，供缓存任务树派生结果的调用方判断是否需要重建。
+        """
+        return TaskNode._status_epoch
+    
+    @classmethod
+    def bump_status_epoch(cls) -> None:
+        """递增状态修改计数（任务树结构变化时由 TaskTree 调用）"""
+        TaskNode._status_epoch += 1
+    
+    @property
+    def display_detail(self) -> str:
+        """任务细节的展示文本（截断到 100 字符）"""
+        if not self.task_detail_info:
+            return ""
+        detail = str(self.task_detail_info)
+        if len(detail) > 100:
+            return detail[:100] + "..."
+        return detail
+    
+    @property
+    def display_dependencies(self) -> str:
+        """依赖列表的展示文本（最多列出 3 个）"""
+        deps_str = ", ".join(self.dependencies[:3])
+        if len(self.dependencies) > 3:
+            deps_str += f", ... (+{len(self.dependencies) - 3} more)"
+        return deps_str
+    
     def is_ready(self, completed_tasks: set) -> bool:
         """
         判断任务是否就绪（所有依赖已完成）
@@ -128,6 +170,7 @@ class TaskNode(BaseModel):
         """添加依赖"""
         if dep_id not in self.dependencies:
             self.dependencies.append(dep_id)
+            TaskNode.bump_status_epoch()
             self.updated_at = datetime.now()
 
 
@@ -164,6 +207,7 @@ class TaskTree(BaseModel):
     def add_task(self, task: TaskNode) -> None:
         """添加任务到树中"""
         self.tasks[task.task_id] = task
+        TaskNode.bump_status_epoch()
         self.updated_at = datetime.now()
         
         # 如果是第一个任务，设为根任务
@@ -160,6 +160,9 @@ class PISALogger:
             level: 日志级别
             **kwargs: 额外的上下文信息
         """
+        # 级别未启用时直接返回，跳过 kwargs 格式化
+        if not self.logger.isEnabledFor(getattr(logging, level.upper())):
+            return
         log_method = getattr(self.logger, level.lower())
         if kwargs:
             message = f"{message} | {self._format_kwargs(kwargs)}"
@@ -0,0 +1,34 @@
+"""
+ContextState 单元测试
+"""
+
+from pisa.core.context.models import ContextState, MessageRole
+
+
+def _make_state(count: int) -> ContextState:
+    state = ContextState(agent_id="agent", session_id="session")
+    for i in range(count):
+        role = MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+        state.add_message(role, f"message {i}")
+    return state
+
+
+def test_recent_messages_match_message_count():
+    """最近消息与消息总数来自同一数据源"""
+    state = _make_state(5)
+
+    assert state.get_message_count() == 5
+    assert [m["content"] for m in state.get_recent_message_dumps()] == [
+        "message 2",
+        "message 3",
+        "message 4",
+    ]
+
+
+def test_recent_messages_survive_serialization():
+    """model_dump / model_validate 往返后最近消息不丢失"""
+    state = _make_state(4)
+    restored = ContextState.model_validate(state.model_dump())
+
+    assert restored.get_message_count() == 4
+    assert restored.get_recent_message_dumps() == state.get_recent_message_dumps()
@@ -0,0 +1,184 @@
+"""
+ExecutionModule 单元测试
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from pisa.capability.models import Capability
+from pisa.capability.registry import CapabilityRegistry
+from pisa.core.loop.modules.base import RetryableError
+from pisa.core.loop.modules.execution import ExecutionModule
+
+
+def search(query: str, max_results: int = 5) -> str:
+    """带默认参数的测试工具"""
+    return f"{query}:{max_results}"
+
+
+# strict 模式的 schema 会把带默认值的参数也列为 required
+STRICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string"},
+        "max_results": {"type": "integer", "default": 5},
+    },
+    "required": ["query", "max_results"],
+    "additionalProperties": False,
+}
+
+
+def _make_module(func, parameters=STRICT_SCHEMA, **kwargs) -> ExecutionModule:
+    registry = CapabilityRegistry()
+    registry.register(
+        Capability(
+            name="search",
+            description="search",
+            parameters=parameters,
+            capability_type="function",
+        ),
+        func,
+    )
+    kwargs.setdefault("max_retries", 1)
+    return ExecutionModule(registry=registry, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_function_with_defaulted_parameter(mock_config):
+    """只传入必需参数时，带默认值的参数不应被预校验拒绝"""
+    module = _make_module(search)
+    try:
+        result = await module.execute("search", {"query": "x"})
+    finally:
+        module.shutdown()
+
+    assert result["success"], result["error"]
+    assert result["result"] == "x:5"
+
+
+@pytest.mark.asyncio
+async def test_strict_function_tool_with_defaulted_parameter(mock_config):
+    """strict FunctionTool 的 schema 列出全部参数，仍应允许省略带默认值的参数"""
+    agents = pytest.importorskip("agents")
+    tool = agents.function_tool(search, strict_mode=True)
+    assert "max_results" in tool.params_json_schema["required"]
+
+    module = _make_module(tool, tool.params_json_schema)
+    try:
+        result = await module.execute("search", {"query": "x"})
+    finally:
+        module.shutdown()
+
+    assert result["success"], result["error"]
+    assert result["result"] == "x:5"
+
+
+@pytest.mark.asyncio
+async def test_missing_required_parameter_fails_fast(mock_config):
+    """缺少无默认值的参数时直接返回失败结果"""
+    module = _make_module(search)
+    try:
+        result = await module.execute("search", {"max_results": 3})
+    finally:
+        module.shutdown()
+
+    assert not result["success"]
+    assert "query" in result["error"]
+    assert result["retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sync_call_timeout_is_not_retried(mock_config, monkeypatch):
+    """线程池中的同步调用超时后无法取消，不应重复执行"""
+    monkeypatch.setattr(ExecutionModule, "_retry_delay", staticmethod(lambda _attempt: 0.0))
+    calls = []
+
+    def slow_search(query: str) -> str:
+        calls.append(query)
+        time.sleep(0.2)
+        return query
+
+    module = _make_module(slow_search, {"type": "object"}, timeout=0.05)
+    try:
+        result = await module.execute("search", {"query": "x"})
+    finally:
+        module.shutdown()
+
+    assert not result["success"]
+    assert result["retries"] == 0
+    assert calls == ["x"]
+
+
+@pytest.mark.asyncio
+async def test_async_call_timeout_is_retried(mock_config, monkeypatch):
+    """协程调用超时时已被取消，可以安全重试"""
+    monkeypatch.setattr(ExecutionModule, "_retry_delay", staticmethod(lambda _attempt: 0.0))
+    calls = []
+
+    async def flaky_search(query: str) -> str:
+        calls.append(query)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return query
+
+    module = _make_module(flaky_search, {"type": "object"}, timeout=0.05)
+    try:
+        result = await module.execute("search", {"query": "x"})
+    finally:
+        module.shutdown()
+
+    assert result["success"], result["error"]
+    assert result["retries"] == 1
+    assert calls == ["x", "x"]
+
+
+@pytest.mark.asyncio
+async def test_connection_error_is_retried_with_backoff(mock_config, monkeypatch):
+    """连接错误按退避重试，成功后返回重试次数并累计到统计信息"""
+    delays = []
+    monkeypatch.setattr(
+        ExecutionModule, "_retry_delay",
+        staticmethod(lambda attempt: delays.append(attempt) or 0.0),
+    )
+    calls = []
+
+    async def flaky_search(query: str) -> str:
+        calls.append(query)
+        if len(calls) < 3:
+            raise ConnectionError("connection reset")
+        return query
+
+    module = _make_module(flaky_search, {"type": "object"}, max_retries=3)
+    try:
+        result = await module.execute("search", {"query": "x"})
+    finally:
+        module.shutdown()
+
+    assert result["success"], result["error"]
+    assert result["retries"] == 2
+    assert delays == [0, 1]
+    assert module.stats["total_retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retryable_error_stops_after_max_retries(mock_config, monkeypatch):
+    """RetryableError 持续发生时重试 max_retries 次后返回失败"""
+    monkeypatch.setattr(ExecutionModule, "_retry_delay", staticmethod(lambda _attempt: 0.0))
+    calls = []
+
+    async def failing_search(query: str) -> str:
+        calls.append(query)
+        raise RetryableError("service unavailable")
+
+    module = _make_module(failing_search, {"type": "object"}, max_retries=2)
+    try:
+        result = await module.execute("search", {"query": "x"})
+    finally:
+        module.shutdown()
+
+    assert not result["success"]
+    assert result["retries"] == 2
+    assert len(calls) == 3
+    assert module.stats["total_retries"] == 2
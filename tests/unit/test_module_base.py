@@ -0,0 +1,126 @@
+"""
+BaseModule 及其辅助类单元测试
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from pisa.core.loop.modules.base import (
+    BaseModule,
+    CachedExecuteMixin,
+    ModulePool,
+    _exceeds_node_limit,
+)
+from pisa.core.loop.modules.observe import ActionType, DecisionResult, ObserveModule
+
+
+class _EchoModule(BaseModule):
+    """返回嵌套结果并记录调用次数的测试模块"""
+
+    STATE_REQUIRES = ['input']
+    STATE_PRODUCES = ['result']
+
+    def __init__(self, **kwargs):
+        super().__init__(module_type="EchoModule", **kwargs)
+        self.calls = 0
+
+    async def _execute(self, state):
+        self.calls += 1
+        return {"result": {"echo": state.input, "items": [1, 2]}}
+
+
+class _CachedEchoModule(CachedExecuteMixin, _EchoModule):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_cached_execute_returns_independent_copies(mock_config):
+    """命中缓存时返回深拷贝，调用方修改结果不会污染缓存"""
+    module = _CachedEchoModule()
+    state = SimpleNamespace(input="x")
+
+    first = await module._execute(state)
+    first["result"]["items"].append(3)
+    second = await module._execute(state)
+    second["result"]["echo"] = "changed"
+    third = await module._execute(state)
+
+    assert module.calls == 1
+    assert third == {"result": {"echo": "x", "items": [1, 2]}}
+
+
+def test_module_pool_resets_subclass_state(mock_config):
+    """复用的实例不保留上一次使用的观察历史与决策统计"""
+    pool = ModulePool(ObserveModule, max_size=1)
+    module = pool.acquire()
+    module._record_decision(
+        DecisionResult(action=ActionType.CONTINUE, reason="ok", confidence=1.0)
+    )
+    pool.release(module)
+
+    reused = pool.acquire()
+
+    assert reused is module
+    assert not reused.observation_context.past_decisions
+    assert reused._get_decision_distribution() == {}
+
+
+def test_cached_execute_rejects_empty_state_requires():
+    """STATE_REQUIRES 为空时所有输入共用一个缓存键，定义时直接拒绝"""
+    with pytest.raises(TypeError):
+        class _Unkeyed(CachedExecuteMixin, BaseModule):
+            async def _execute(self, state):
+                return {}
+
+
+class _LockModule(_EchoModule):
+    """结果无法深拷贝的测试模块"""
+
+    async def _execute(self, state):
+        await asyncio.sleep(0)
+        return {"result": threading.Lock()}
+
+
+class _UncopyableModule(CachedExecuteMixin, _LockModule):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_cached_execute_copy_failure_reaches_waiters(mock_config):
+    """结果复制失败时，等待同一请求的并发调用方收到异常而不是一直挂起"""
+    module = _UncopyableModule()
+    state = SimpleNamespace(input="x")
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            module._execute(state), module._execute(state), return_exceptions=True
+        ),
+        timeout=1,
+    )
+
+    assert all(isinstance(r, TypeError) for r in results)
+
+
+def test_planning_module_has_no_instance_dict_entries(mock_config):
+    """默认配置下实例属性全部位于 slot 中，不向 __dict__ 写入任何内容"""
+    from pisa.core.loop.modules.planning import PlanningModule
+
+    assert PlanningModule().__dict__ == {}
+
+
+@pytest.mark.parametrize(
+    ("data", "limit", "expected"),
+    [
+        ({"a": [1, 2]}, 4, False),
+        ({"a": [1, 2]}, 3, True),
+        ([[1], [2, [3]]], 7, False),
+        ([[1], [2, [3]]], 6, True),
+        ({"x": list(range(1_000_000))}, 200, True),
+    ],
+)
+def test_exceeds_node_limit(data, limit, expected):
+    """按节点总数（含容器本身）与上限比较"""
+    assert _exceeds_node_limit(data, limit) is expected
@@ -0,0 +1,65 @@
+"""
+ObserveModule 单元测试
+"""
+
+import pytest
+
+from pisa.core.loop.modules.observe import (
+    ActionType,
+    FailureType,
+    ObserveModule,
+    TaskObservation,
+)
+from pisa.core.loop.state import LoopState
+
+
+@pytest.fixture
+def observe_module(mock_config):
+    return ObserveModule()
+
+
+@pytest.mark.parametrize(
+    ("message", "expected"),
+    [
+        ("Request TIMED OUT after 30s", FailureType.TIMEOUT),
+        ("capability not found", FailureType.CAPABILITY_MISSING),
+        ("Connection reset by peer", FailureType.TRANSIENT),
+        ("malformed response", FailureType.VALIDATION_FAILED),
+        ("prerequisite step failed", FailureType.DEPENDENCY_FAILED),
+        ("bad argument: x", FailureType.PARAMETER_ERROR),
+        ("initialization error", FailureType.SYSTEMATIC),
+        ("something odd happened", FailureType.UNKNOWN),
+        ("", FailureType.UNKNOWN),
+        # 多个类型同时命中时按规则顺序，而不是按关键词在文本中的位置
+        ("invalid input, then network timeout", FailureType.TIMEOUT),
+        ("config missing", FailureType.CAPABILITY_MISSING),
+        ("invalid parameter", FailureType.VALIDATION_FAILED),
+    ],
+)
+def test_classify_error(observe_module, message, expected):
+    assert observe_module._classify_error(message) is expected
+
+
+def test_classify_error_long_message(observe_module):
+    """长错误信息末尾的关键词同样能被识别"""
+    message = "x" * 20_000 + " Dependency failed"
+    assert observe_module._classify_error(message) is FailureType.DEPENDENCY_FAILED
+
+
+@pytest.mark.asyncio
+async def test_decide_after_json_round_trip(observe_module):
+    """经 LoopState.to_json / from_json 往返后，dict 中的字符串字段会被重新转换"""
+    observation = TaskObservation(
+        task_id="t1",
+        task_description="fetch data",
+        success=False,
+        error="connection reset",
+        error_type=FailureType.TRANSIENT,
+    )
+    state = LoopState(observation=observation.model_dump())
+    restored = LoopState.from_json(state.to_json())
+    assert restored.observation["error_type"] == "transient"
+
+    new_state = await observe_module.decide(restored)
+
+    assert new_state.decision.action == ActionType.RETRY
@@ -0,0 +1,67 @@
+"""
+PlanningModule 单元测试
+"""
+
+import pytest
+
+from pisa.core.loop.modules.planning import PlanningModule
+from pisa.core.planning.task_tree import TaskNode, TaskStatus, TaskTree
+
+
+def _make_tree(*specs) -> TaskTree:
+    """specs 为 (task_id, dependencies) 序列，execution_order 与给出顺序一致"""
+    tree = TaskTree(root_goal="goal")
+    for task_id, dependencies in specs:
+        tree.add_task(TaskNode(
+            task_id=task_id,
+            task_description=task_id,
+            dependencies=list(dependencies),
+        ))
+    tree.execution_order = [task_id for task_id, _ in specs]
+    return tree
+
+
+@pytest.fixture
+def planning_module(mock_config):
+    return PlanningModule()
+
+
+def test_plan_completion_sees_direct_status_changes(planning_module):
+    """绕过 mark_task_* 直接修改任务状态后，缓存的完成判断随之更新"""
+    tree = _make_tree(("A", ()), ("B", ("A",)))
+    planning_module.current_tree = tree
+
+    assert not planning_module.is_plan_completed()
+
+    for task in tree.tasks.values():
+        task.status = TaskStatus.COMPLETED
+
+    assert planning_module.is_plan_completed()
+
+
+def test_next_task_after_mark_task_completed(planning_module):
+    """经 mark_task_completed 完成任务时就地释放后继，不重建就绪队列"""
+    tree = _make_tree(("A", ()), ("B", ("A",)), ("C", ()))
+    planning_module.current_tree = tree
+
+    assert planning_module.get_next_task().task_id == "A"
+    heap = planning_module._ready_heap
+
+    planning_module.mark_task_completed("A")
+
+    assert planning_module.get_next_task().task_id == "B"
+    assert planning_module._ready_heap is heap
+
+
+def test_next_task_after_direct_status_change(planning_module):
+    """绕过本模块直接修改任务状态后，就绪队列重建并与任务树的选择一致"""
+    tree = _make_tree(("A", ()), ("B", ("A",)), ("C", ()))
+    planning_module.current_tree = tree
+
+    assert planning_module.get_next_task().task_id == "A"
+
+    tree.tasks["A"].status = TaskStatus.COMPLETED
+
+    assert planning_module.get_next_task() is tree.get_next_task()
+    assert planning_module.get_next_task().task_id == "B"
+    assert [t.task_id for t in planning_module.get_ready_batch()] == ["B", "C"]